@@ -1,16 +1,80 @@
 import boto3
+import codecs
 import json
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import itertools
+import os
+import threading
 import time
 
+def iter_json_array_records(chunks):
+    """
+    Incrementally decode the elements of a top-level JSON array from an
+    iterable of byte chunks, without holding the whole document in memory
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    buffer = ''
+    array_opened = False
+    exhausted = False
+    
+    while True:
+        position = 0
+        while True:
+            # Skip whitespace, the opening bracket and record separators
+            while position < len(buffer) and (buffer[position] in ' \t\r\n,\ufeff' or
+                                              (buffer[position] == '[' and not array_opened)):
+                if buffer[position] == '[':
+                    array_opened = True
+                position += 1
+            
+            if position >= len(buffer):
+                break
+            if buffer[position] == ']':
+                return
+            
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+                break  # Record continues in the next chunk
+            if end == len(buffer) and not exhausted:
+                break  # A number ending the chunk ("[12" + "345]") may continue in the next one
+            position = end
+            yield record
+        
+        buffer = buffer[position:]
+        if exhausted:
+            return
+        
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+            buffer += text_decoder.decode(b'', final=True)
+        else:
+            buffer += text_decoder.decode(chunk)
+
+
 class YogyakartaTourismDataCrawler:
-    def __init__(self, region_name='us-east-1'):
+    def __init__(self, region_name='us-east-1', endpoint_url=None):
         """
         Initialize AWS clients for Glue service
+        
+        endpoint_url can point the clients at a local stand-in (e.g. moto server)
         """
-        self.glue_client = boto3.client('glue', region_name=region_name)
-        self.s3_client = boto3.client('s3', region_name=region_name)
-        self.iam_client = boto3.client('iam', region_name=region_name)
+        # Clients are shared across worker threads, so size their connection pools
+        self.max_pool_connections = 32
+        client_config = Config(max_pool_connections=self.max_pool_connections)
+        
+        self.glue_client = boto3.client('glue', region_name=region_name, endpoint_url=endpoint_url,
+                                        config=client_config)
+        self.s3_client = boto3.client('s3', region_name=region_name, endpoint_url=endpoint_url,
+                                      config=client_config)
+        self.iam_client = boto3.client('iam', region_name=region_name, endpoint_url=endpoint_url)
         
         # Configuration
         self.bucket_name = 'rdv-apify-storage'
@@ -18,14 +82,133 @@ class YogyakartaTourismDataCrawler:
         self.crawler_role_name = 'LabRole'
         self.crawler_name = 'yogyakarta-tourism-crawler'
         
-        # S3 paths for different data sources
+        # Crawler polling: start fast, back off while the crawl is still running
+        self.poll_initial_delay = 2
+        self.poll_max_delay = 30
+        self.poll_backoff = 1.5
+        self.crawler_timeout = 1800
+        
+        # Catalog introspection: get_partitions segments (max 10) and report cache
+        self.partition_segments = 4
+        self.catalog_cache_path = 'yogyakarta_tourism_catalog_cache.json'
+        
+        self.table_prefix = 'yogya_tourism_'
+        self.json_classifier_name = 'yogyakarta-tourism-json-array'
+        
+        # Raw layout: raw-json/<source>/scrape_date=YYYY-MM-DD/<scraped file>
+        self.raw_prefix = 'raw-json'
+        self.source_files = {
+            'booking_hotels': 'booking - full hotel.json',
+            'booking_reviews': 'booking - full review of hotel.json',
+            'tripadvisor_hotels': 'tripadvisor - full hotel.json',
+            'tripadvisor_reviews': 'tripadvisor - full review of hotel.json',
+            'geospatial_attractions': 'geospatial tujuan wisata.json'
+        }
+        
+        # S3 prefixes for different data sources, one Glue table each
         self.s3_paths = {
-            'booking_hotels': 's3://rdv-apify-storage/raw-json/booking - full hotel.json',
-            'booking_reviews': 's3://rdv-apify-storage/raw-json/booking - full review of hotel.json',
-            'tripadvisor_hotels': 's3://rdv-apify-storage/raw-json/tripadvisor - full hotel.json',
-            'tripadvisor_reviews': 's3://rdv-apify-storage/raw-json/tripadvisor - full review of hotel.json',
-            'geospatial_attractions': 's3://rdv-apify-storage/raw-json/geospatial tujuan wisata.json'
+            source: f's3://{self.bucket_name}/{self.raw_prefix}/{source}/'
+            for source in self.source_files
+        }
+        
+        # Expected data structure based on provided samples
+        self.expected_structures = {
+            'booking_hotels': {
+                'required_fields': ['name', 'type', 'stars', 'location', 'address', 'facilities', 'hotelId'],
+                'field_types': {
+                    'name': 'string',
+                    'type': 'string',
+                    'stars': 'number',
+                    'location': 'object',
+                    'address': 'object',
+                    'facilities': 'array',
+                    'hotelId': 'number'
+                },
+                'location_fields': ['lat', 'lng'],
+                'address_fields': ['full', 'street', 'country', 'region', 'postalCode'],
+                'facilities_structure': 'nested_array_with_categories'
+            },
+            'booking_reviews': {
+                'required_fields': ['rating', 'reviewTitle', 'travelerType', 'hotelRatingScores', 'hotelId'],
+                'field_types': {
+                    'rating': 'number',
+                    'reviewTitle': 'string',
+                    'travelerType': 'string',
+                    'hotelRatingScores': 'array',
+                    'hotelId': 'number'
+                },
+                'rating_categories': ['Staff', 'Facilities', 'Cleanliness', 'Comfort', 'Value for money', 'Location'],
+                'temporal_fields': ['checkInDate', 'checkOutDate', 'reviewDate']
+            },
+            'tripadvisor_hotels': {
+                'required_fields': ['name', 'type', 'category', 'rating', 'latitude', 'longitude', 'amenities'],
+                'field_types': {
+                    'name': 'string',
+                    'type': 'string',
+                    'category': 'string',
+                    'rating': 'number',
+                    'latitude': 'number',
+                    'longitude': 'number',
+                    'amenities': 'array'
+                },
+                'location_fields': ['latitude', 'longitude', 'address', 'addressObj'],
+                'amenities_structure': 'simple_array'
+            },
+            'tripadvisor_reviews': {
+                'required_fields': ['rating', 'text', 'title', 'locationId', 'publishedDate'],
+                'field_types': {
+                    'rating': 'number',
+                    'text': 'string',
+                    'title': 'string',
+                    'locationId': 'string',
+                    'publishedDate': 'string'
+                },
+                'user_structure': 'nested_object',
+                'place_info_structure': 'nested_object'
+            },
+            'geospatial_attractions': {
+                'required_fields': ['title', 'categoryName', 'location', 'totalScore', 'reviewsCount'],
+                'field_types': {
+                    'title': 'string',
+                    'categoryName': 'string',
+                    'location': 'object',
+                    'totalScore': 'number',
+                    'reviewsCount': 'number'
+                },
+                'location_fields': ['lat', 'lng'],
+                'additional_info_structure': 'complex_nested_object'
+            }
         }
+        
+        # Sampled content validation: records per object and ranged GET size
+        self.validation_sample_size = 50
+        self.validation_chunk_size = 64 * 1024
+
+    def raw_object_key(self, source, scrape_date=None):
+        """
+        Build the S3 key of a raw scrape file inside its date partition
+        """
+        scrape_date = scrape_date or time.strftime('%Y-%m-%d')
+        return f"{self.raw_prefix}/{source}/scrape_date={scrape_date}/{self.source_files[source]}"
+
+    def upload_raw_file(self, source, local_path, scrape_date=None):
+        """
+        Upload a scraped JSON file into a new scrape_date partition
+        """
+        key = self.raw_object_key(source, scrape_date)
+        self.s3_client.upload_file(local_path, self.bucket_name, key)
+        print(f"Uploaded {local_path} to s3://{self.bucket_name}/{key}")
+        return key
+
+    def list_raw_objects(self, source):
+        """
+        List every raw object of a source across all scrape_date partitions
+        """
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        objects = []
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=f"{self.raw_prefix}/{source}/"):
+            objects.extend(page.get('Contents', []))
+        return objects
 
     # def create_iam_role_for_crawler(self):
     #     """
@@ -136,56 +319,163 @@ class YogyakartaTourismDataCrawler:
         """
         print("Verifying S3 data structure...")
         
-        # Expected data structure based on provided samples
-        expected_structures = {
-            'booking_hotels': {
-                'required_fields': ['name', 'type', 'stars', 'location', 'address', 'facilities', 'hotelId'],
-                'location_fields': ['lat', 'lng'],
-                'address_fields': ['full', 'street', 'country', 'region', 'postalCode'],
-                'facilities_structure': 'nested_array_with_categories'
-            },
-            'booking_reviews': {
-                'required_fields': ['rating', 'reviewTitle', 'travelerType', 'hotelRatingScores', 'hotelId'],
-                'rating_categories': ['Staff', 'Facilities', 'Cleanliness', 'Comfort', 'Value for money', 'Location'],
-                'temporal_fields': ['checkInDate', 'checkOutDate', 'reviewDate']
-            },
-            'tripadvisor_hotels': {
-                'required_fields': ['name', 'type', 'category', 'rating', 'latitude', 'longitude', 'amenities'],
-                'location_fields': ['latitude', 'longitude', 'address', 'addressObj'],
-                'amenities_structure': 'simple_array'
-            },
-            'tripadvisor_reviews': {
-                'required_fields': ['rating', 'text', 'title', 'locationId', 'publishedDate'],
-                'user_structure': 'nested_object',
-                'place_info_structure': 'nested_object'
-            },
-            'geospatial_attractions': {
-                'required_fields': ['title', 'categoryName', 'location', 'totalScore', 'reviewsCount'],
-                'location_fields': ['lat', 'lng'],
-                'additional_info_structure': 'complex_nested_object'
-            }
-        }
-        
-        # Check if files exist in S3
-        for data_type, s3_path in self.s3_paths.items():
-            bucket_name = s3_path.split('/')[2]
-            key = '/'.join(s3_path.split('/')[3:])
+        # Check that each source prefix has at least one scrape partition
+        for data_type in self.s3_paths:
+            prefix = f"{self.raw_prefix}/{data_type}/"
             
             try:
-                response = self.s3_client.head_object(Bucket=bucket_name, Key=key)
-                file_size = response['ContentLength']
-                print(f"✓ {data_type}: Found file at {key} (Size: {file_size} bytes)")
+                objects = self.list_raw_objects(data_type)
+                if not objects:
+                    print(f"✗ {data_type}: No files found under {prefix}")
+                    continue
+                
+                partitions = sorted({obj['Key'].split('/')[2] for obj in objects if obj['Key'].count('/') >= 3})
+                total_size = sum(obj['Size'] for obj in objects)
+                print(f"✓ {data_type}: Found {len(objects)} files in {len(partitions)} partitions "
+                      f"under {prefix} (Size: {total_size} bytes)")
+                if partitions:
+                    print(f"  - Latest partition: {partitions[-1]}")
                 
                 # Get expected structure info
-                if data_type in expected_structures:
-                    structure = expected_structures[data_type]
+                if data_type in self.expected_structures:
+                    structure = self.expected_structures[data_type]
                     print(f"  - Expected fields: {', '.join(structure['required_fields'])}")
                 
             except ClientError as e:
-                if e.response['Error']['Code'] == '404':
-                    print(f"✗ {data_type}: File not found at {key}")
-                else:
-                    print(f"✗ {data_type}: Error accessing file - {e}")
+                print(f"✗ {data_type}: Error listing {prefix} - {e}")
+
+    def iter_raw_object_chunks(self, key):
+        """
+        Yield the bytes of a raw object one ranged GET at a time
+        """
+        chunk_size = self.validation_chunk_size
+        offset = 0
+        total_size = None
+        
+        while total_size is None or offset < total_size:
+            try:
+                response = self.s3_client.get_object(
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    Range=f"bytes={offset}-{offset + chunk_size - 1}"
+                )
+            except ClientError as e:
+                if e.response['Error']['Code'] == 'InvalidRange':
+                    return  # Empty object
+                raise
+            data = response['Body'].read()
+            if not data:
+                return
+            offset += len(data)
+            total_size = int(response['ContentRange'].split('/')[-1])
+            yield data
+
+    def sample_raw_records(self, key, sample_size=None):
+        """
+        Stream the first sample_size records of a raw JSON array object using
+        ranged GETs; later ranges are never requested
+        """
+        sample_size = sample_size or self.validation_sample_size
+        records = iter_json_array_records(self.iter_raw_object_chunks(key))
+        return list(itertools.islice(records, sample_size))
+
+    def _json_type_name(self, value):
+        """
+        Map a decoded JSON value to the type names used in expected_structures
+        """
+        if isinstance(value, bool):
+            return 'boolean'
+        if isinstance(value, (int, float)):
+            return 'number'
+        if isinstance(value, str):
+            return 'string'
+        if isinstance(value, dict):
+            return 'object'
+        if isinstance(value, list):
+            return 'array'
+        return 'null'
+
+    def validate_sampled_content(self, sample_size=None, max_workers=None):
+        """
+        Check sampled records of every raw object against expected_structures,
+        reporting field coverage and type mismatches per source
+        """
+        print("Validating sampled raw content...")
+        
+        with ThreadPoolExecutor(max_workers=len(self.s3_paths)) as executor:
+            listings = dict(zip(self.s3_paths, executor.map(self.list_raw_objects, self.s3_paths)))
+        
+        tasks = [(source, obj['Key']) for source, objects in listings.items() for obj in objects]
+        samples = {source: [] for source in self.s3_paths}
+        
+        with ThreadPoolExecutor(max_workers=max_workers or self.max_pool_connections) as executor:
+            futures = {executor.submit(self.sample_raw_records, key, sample_size): (source, key)
+                       for source, key in tasks}
+            for future in as_completed(futures):
+                source, key = futures[future]
+                try:
+                    samples[source].extend(future.result())
+                except (ClientError, ValueError) as e:
+                    print(f"✗ {source}: Could not sample {key} - {e}")
+        
+        results = {}
+        for source, records in samples.items():
+            structure = self.expected_structures.get(source, {})
+            field_types = structure.get('field_types', {})
+            coverage = {}
+            type_mismatches = {}
+            
+            for field in structure.get('required_fields', []):
+                values = [record.get(field) for record in records if isinstance(record, dict)]
+                present = [value for value in values if value is not None]
+                coverage[field] = len(present) / len(records) if records else 0.0
+                
+                expected_type = field_types.get(field)
+                found_types = {}
+                for value in present:
+                    type_name = self._json_type_name(value)
+                    if expected_type and type_name != expected_type:
+                        found_types[type_name] = found_types.get(type_name, 0) + 1
+                if found_types:
+                    type_mismatches[field] = {'expected': expected_type, 'found': found_types}
+            
+            results[source] = {
+                'objects_sampled': len(listings.get(source, [])),
+                'records_sampled': len(records),
+                'field_coverage': coverage,
+                'type_mismatches': type_mismatches
+            }
+            
+            status = "✓" if records and not type_mismatches and all(v == 1.0 for v in coverage.values()) else "✗"
+            print(f"{status} {source}: {len(records)} records sampled from {results[source]['objects_sampled']} objects")
+            for field, ratio in coverage.items():
+                if ratio < 1.0:
+                    print(f"  - {field}: present in {ratio:.0%} of sampled records")
+            for field, mismatch in type_mismatches.items():
+                print(f"  - {field}: expected {mismatch['expected']}, found {mismatch['found']}")
+        
+        return results
+
+    def create_json_classifier(self):
+        """
+        Create a JSON classifier that turns each element of the top-level
+        array into its own row instead of one array<struct> column
+        """
+        classifier = {
+            'Name': self.json_classifier_name,
+            'JsonPath': '$[*]'
+        }
+        
+        try:
+            self.glue_client.create_classifier(JsonClassifier=classifier)
+            print(f"Created JSON classifier: {self.json_classifier_name}")
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'AlreadyExistsException':
+                self.glue_client.update_classifier(JsonClassifier=classifier)
+                print(f"Updated JSON classifier: {self.json_classifier_name}")
+            else:
+                print(f"Error creating classifier: {e}")
+                raise
 
     def create_crawler_with_multiple_targets(self):
         """
@@ -199,15 +489,12 @@ class YogyakartaTourismDataCrawler:
             print("IAM role not found. Creating new role...")
             # role_arn = self.create_iam_role_for_crawler()
         
-        # Define S3 targets for crawler
+        # One S3 target per source prefix, so every source gets its own table
+        # and each scrape_date folder becomes a partition of it
         s3_targets = []
         for data_type, s3_path in self.s3_paths.items():
-            # Extract path without filename for crawler target
-            path_parts = s3_path.split('/')
-            s3_target_path = '/'.join(path_parts[:-1]) + '/'
-            
             s3_targets.append({
-                'Path': s3_target_path,
+                'Path': s3_path,
                 'Exclusions': [
                     '*.tmp',
                     '*.log',
@@ -215,14 +502,6 @@ class YogyakartaTourismDataCrawler:
                 ]
             })
         
-        # Remove duplicates (since all files are in the same folder)
-        unique_s3_targets = []
-        seen_paths = set()
-        for target in s3_targets:
-            if target['Path'] not in seen_paths:
-                unique_s3_targets.append(target)
-                seen_paths.add(target['Path'])
-        
         # Crawler configuration
         crawler_config = {
             'Name': self.crawler_name,
@@ -230,15 +509,17 @@ class YogyakartaTourismDataCrawler:
             'DatabaseName': self.database_name,
             'Description': 'Crawler for Yogyakarta Tourism accommodation data from multiple sources',
             'Targets': {
-                'S3Targets': unique_s3_targets
+                'S3Targets': s3_targets
             },
-            'TablePrefix': 'yogya_tourism_',
+            'TablePrefix': self.table_prefix,
+            'Classifiers': [self.json_classifier_name],
+            # Incremental crawls require schema changes to be logged only
             'SchemaChangePolicy': {
-                'UpdateBehavior': 'UPDATE_IN_DATABASE',
-                'DeleteBehavior': 'DEPRECATE_IN_DATABASE'
+                'UpdateBehavior': 'LOG',
+                'DeleteBehavior': 'LOG'
             },
             'RecrawlPolicy': {
-                'RecrawlBehavior': 'CRAWL_EVERYTHING'
+                'RecrawlBehavior': 'CRAWL_NEW_FOLDERS_ONLY'
             },
             'LineageConfiguration': {
                 'CrawlerLineageSettings': 'ENABLE'
@@ -253,8 +534,9 @@ class YogyakartaTourismDataCrawler:
                         "AddOrUpdateBehavior": "MergeNewColumns"
                     }
                 },
+                # bucket/raw-json/<source>/ -> table at level 3
                 "Grouping": {
-                    "TableGroupingPolicy": "CombineCompatibleSchemas"
+                    "TableLevelConfiguration": 3
                 }
             })
         }
@@ -282,35 +564,131 @@ class YogyakartaTourismDataCrawler:
                 print(f"Error creating crawler: {e}")
                 raise
 
+    def start_crawler(self, crawler_name):
+        """
+        Start a crawler, tolerating one that is already running
+        """
+        try:
+            self.glue_client.start_crawler(Name=crawler_name)
+            print(f"Started crawler: {crawler_name}")
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'CrawlerRunningException':
+                print(f"Crawler {crawler_name} is already running, waiting for it")
+            else:
+                raise
+
+    def wait_for_crawler(self, crawler_name, timeout=None, cancel_event=None, started_after=None):
+        """
+        Poll a crawler with adaptive backoff until it is READY again and
+        return its LastCrawl metrics
+        
+        started_after is the epoch time the crawl was started, so a crawl that
+        finished between two polls is still recognised. Raises TimeoutError
+        after timeout seconds; setting cancel_event returns early. Both stop
+        the running crawl.
+        """
+        timeout = timeout if timeout is not None else self.crawler_timeout
+        cancel_event = cancel_event or threading.Event()
+        deadline = time.monotonic() + timeout
+        delay = self.poll_initial_delay
+        seen_running = False
+        
+        while True:
+            response = self.glue_client.get_crawler(Name=crawler_name)
+            crawler = response['Crawler']
+            state = crawler['State']
+            
+            if state in ('RUNNING', 'STOPPING'):
+                seen_running = True
+            elif state == 'READY':
+                last_crawl = crawler.get('LastCrawl', {})
+                start_time = last_crawl.get('StartTime')
+                if (seen_running or started_after is None or
+                        (start_time is not None and start_time.timestamp() >= started_after)):
+                    print(f"Crawler {crawler_name} finished with status {last_crawl.get('Status', 'UNKNOWN')}")
+                    return last_crawl
+            
+            if cancel_event.is_set():
+                self._stop_crawler_quietly(crawler_name)
+                print(f"Crawler {crawler_name} cancelled")
+                return {'Status': 'CANCELLED'}
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._stop_crawler_quietly(crawler_name)
+                raise TimeoutError(f"Crawler {crawler_name} did not finish within {timeout} seconds")
+            
+            # READY here means the start has not been picked up yet and STOPPING
+            # is the last state before READY, so both poll at the short interval
+            if state in ('READY', 'STOPPING'):
+                delay = self.poll_initial_delay
+            
+            # Event.wait doubles as an interruptible sleep
+            cancel_event.wait(min(delay, remaining))
+            if state == 'RUNNING':
+                delay = min(delay * self.poll_backoff, self.poll_max_delay)
+
+    def _stop_crawler_quietly(self, crawler_name):
+        """
+        Stop a crawler, ignoring the error raised when it is not running
+        """
+        try:
+            self.glue_client.stop_crawler(Name=crawler_name)
+        except ClientError as e:
+            if e.response['Error']['Code'] not in ('CrawlerNotRunningException', 'CrawlerStoppingException'):
+                raise
+
+    def run_crawlers_concurrently(self, crawler_names, timeout=None, cancel_event=None, max_workers=None):
+        """
+        Start several crawlers at once and wait for all of them in a thread pool
+        
+        Returns a dict of crawler name to LastCrawl metrics. Crawlers that time
+        out or raise are reported with Status 'FAILED' and an ErrorMessage.
+        """
+        cancel_event = cancel_event or threading.Event()
+        results = {}
+        
+        def start_and_wait(crawler_name):
+            started_after = time.time()
+            self.start_crawler(crawler_name)
+            return self.wait_for_crawler(crawler_name, timeout=timeout, cancel_event=cancel_event,
+                                         started_after=started_after)
+        
+        with ThreadPoolExecutor(max_workers=max_workers or len(crawler_names) or 1) as executor:
+            futures = {executor.submit(start_and_wait, name): name for name in crawler_names}
+            try:
+                for future in as_completed(futures):
+                    crawler_name = futures[future]
+                    try:
+                        results[crawler_name] = future.result()
+                    except (ClientError, TimeoutError) as e:
+                        print(f"Error running crawler {crawler_name}: {e}")
+                        results[crawler_name] = {'Status': 'FAILED', 'ErrorMessage': str(e)}
+            except KeyboardInterrupt:
+                # Let the waiting threads stop their crawlers before exiting
+                cancel_event.set()
+                raise
+        
+        return results
+
     def run_crawler(self):
         """
         Start the Glue crawler to discover schema
         """
         try:
-            response = self.glue_client.start_crawler(Name=self.crawler_name)
-            print(f"Started crawler: {self.crawler_name}")
-            
-            # Monitor crawler status
             print("Monitoring crawler execution...")
-            while True:
-                response = self.glue_client.get_crawler(Name=self.crawler_name)
-                state = response['Crawler']['State']
-                
-                print(f"Crawler state: {state}")
-                
-                if state == 'READY':
-                    last_crawl = response['Crawler'].get('LastCrawl', {})
-                    if last_crawl:
-                        print(f"Crawler completed successfully!")
-                        print(f"Tables created: {last_crawl.get('TablesCreated', 0)}")
-                        print(f"Tables updated: {last_crawl.get('TablesUpdated', 0)}")
-                        print(f"Tables deleted: {last_crawl.get('TablesDeleted', 0)}")
-                    break
-                elif state == 'STOPPING' or state == 'STOPPED':
-                    print("Crawler stopped")
-                    break
-                
-                time.sleep(30)  # Wait 30 seconds before checking again
+            results = self.run_crawlers_concurrently([self.crawler_name])
+            last_crawl = results[self.crawler_name]
+            
+            if last_crawl.get('Status') == 'SUCCEEDED':
+                print(f"Crawler completed successfully!")
+                print(f"Tables created: {last_crawl.get('TablesCreated', 0)}")
+                print(f"Tables updated: {last_crawl.get('TablesUpdated', 0)}")
+                print(f"Tables deleted: {last_crawl.get('TablesDeleted', 0)}")
+            else:
+                print(f"Crawler stopped: {last_crawl.get('ErrorMessage', last_crawl.get('Status'))}")
+            
+            return last_crawl
                 
         except ClientError as e:
             print(f"Error running crawler: {e}")
@@ -321,8 +699,10 @@ class YogyakartaTourismDataCrawler:
         Get information about tables discovered by the crawler
         """
         try:
-            response = self.glue_client.get_tables(DatabaseName=self.database_name)
-            tables = response['TableList']
+            paginator = self.glue_client.get_paginator('get_tables')
+            tables = []
+            for page in paginator.paginate(DatabaseName=self.database_name):
+                tables.extend(page['TableList'])
             
             print(f"\nDiscovered {len(tables)} tables in database '{self.database_name}':")
             print("=" * 80)
@@ -361,42 +741,152 @@ class YogyakartaTourismDataCrawler:
             print(f"Error getting tables: {e}")
             raise
 
+    def get_table_partitions(self, table_name, expression=None):
+        """
+        Fetch all partitions of a table, reading get_partitions segments in parallel
+
+        With a get_partitions filter expression only the matching partitions
+        are fetched, in a single segment.
+        """
+        total_segments = 1 if expression else self.partition_segments
+        extra_args = {'Expression': expression} if expression else {}
+        
+        def fetch_segment(segment_number):
+            paginator = self.glue_client.get_paginator('get_partitions')
+            partitions = []
+            for page in paginator.paginate(
+                DatabaseName=self.database_name,
+                TableName=table_name,
+                Segment={'SegmentNumber': segment_number, 'TotalSegments': total_segments},
+                ExcludeColumnSchema=True,
+                **extra_args
+            ):
+                partitions.extend(page['Partitions'])
+            return partitions
+        
+        with ThreadPoolExecutor(max_workers=total_segments) as executor:
+            segments = list(executor.map(fetch_segment, range(total_segments)))
+        
+        return [partition for segment in segments for partition in segment]
+
+    def _table_version(self, table):
+        """
+        Version stamp of a catalog table, used as the report cache key
+        """
+        update_time = table.get('UpdateTime') or table.get('CreateTime')
+        return update_time.isoformat() if update_time else None
+
+    def _describe_table(self, table):
+        """
+        Build the report entry of a single table, including partition metadata
+        """
+        storage_descriptor = table.get('StorageDescriptor', {})
+        table_info = {
+            'name': table['Name'],
+            'update_time': self._table_version(table),
+            'location': storage_descriptor.get('Location', ''),
+            'input_format': storage_descriptor.get('InputFormat', ''),
+            'output_format': storage_descriptor.get('OutputFormat', ''),
+            'columns': [],
+            'partition_keys': [pk['Name'] for pk in table.get('PartitionKeys', [])],
+            'partitions': [],
+            'row_count': table.get('Parameters', {}).get('recordCount', 'Unknown'),
+            'file_size': table.get('Parameters', {}).get('sizeKey', 'Unknown')
+        }
+        
+        # Add column details
+        for col in storage_descriptor.get('Columns', []):
+            table_info['columns'].append({
+                'name': col.get('Name'),
+                'type': col.get('Type'),
+                'comment': col.get('Comment', '')
+            })
+        
+        return self._refresh_partitions(table_info)
+
+    def _refresh_partitions(self, table_info):
+        """
+        Bring the partitions of a report entry up to date; adding partitions
+        does not change the table's UpdateTime, so cached entries need this
+        as well
+
+        scrape_date partitions are only ever added, so an entry that already
+        lists partitions only fetches those after its latest one. Entries
+        without cached partitions, or with several partition keys, are
+        listed in full.
+        """
+        keys = table_info['partition_keys']
+        if len(keys) == 1 and table_info['partitions']:
+            latest = table_info['partitions'][-1][0].replace("'", "''")
+            partitions = self.get_table_partitions(table_info['name'], expression=f"{keys[0]} > '{latest}'")
+            known = {tuple(values) for values in table_info['partitions']}
+            added = [partition['Values'] for partition in partitions if tuple(partition['Values']) not in known]
+            table_info['partitions'] = sorted(table_info['partitions'] + added)
+        elif keys:
+            partitions = self.get_table_partitions(table_info['name'])
+            table_info['partitions'] = sorted(partition['Values'] for partition in partitions)
+        table_info['partition_count'] = len(table_info['partitions'])
+        
+        return table_info
+
+    def _load_catalog_cache(self):
+        """
+        Load cached report entries keyed by table name
+        """
+        if not os.path.exists(self.catalog_cache_path):
+            return {}
+        try:
+            with open(self.catalog_cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable catalog cache: {e}")
+            return {}
+
     def generate_data_catalog_report(self):
         """
         Generate comprehensive report of discovered data catalog
+        
+        Tables whose UpdateTime matches the cached report reuse their cached
+        columns and partitions, and only fetch partitions added since; new or
+        changed tables are described in full. Both run in parallel.
         """
         try:
             tables = self.get_discovered_tables()
+            cache = self._load_catalog_cache()
+            
+            cached_entries = {}
+            changed_tables = []
+            for table in tables:
+                cached = cache.get(table['Name'])
+                if cached and cached.get('update_time') == self._table_version(table):
+                    cached_entries[table['Name']] = cached
+                else:
+                    changed_tables.append(table)
+            
+            print(f"Catalog report: {len(cached_entries)} tables unchanged, "
+                  f"{len(changed_tables)} tables to describe")
+            
+            with ThreadPoolExecutor(max_workers=max(1, min(len(tables), 8))) as executor:
+                refreshed = list(executor.map(self._refresh_partitions, cached_entries.values()))
+                described = list(executor.map(self._describe_table, changed_tables))
+            cached_entries = {table_info['name']: table_info for table_info in refreshed}
+            fresh_entries = {table_info['name']: table_info for table_info in described}
             
             # Generate detailed report
             report = {
                 'database_name': self.database_name,
                 'total_tables': len(tables),
                 'discovery_timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
-                'tables': []
+                'tables': [
+                    fresh_entries.get(table['Name']) or cached_entries[table['Name']]
+                    for table in tables
+                ]
             }
             
-            for table in tables:
-                table_info = {
-                    'name': table['Name'],
-                    'location': table.get('StorageDescriptor', {}).get('Location', ''),
-                    'input_format': table.get('StorageDescriptor', {}).get('InputFormat', ''),
-                    'output_format': table.get('StorageDescriptor', {}).get('OutputFormat', ''),
-                    'columns': [],
-                    'row_count': table.get('Parameters', {}).get('recordCount', 'Unknown'),
-                    'file_size': table.get('Parameters', {}).get('sizeKey', 'Unknown')
-                }
-                
-                # Add column details
-                columns = table.get('StorageDescriptor', {}).get('Columns', [])
-                for col in columns:
-                    table_info['columns'].append({
-                        'name': col.get('Name'),
-                        'type': col.get('Type'),
-                        'comment': col.get('Comment', '')
-                    })
-                
-                report['tables'].append(table_info)
+            # Tables dropped from the catalog fall out of the cache here
+            with open(self.catalog_cache_path, 'w', encoding='utf-8') as f:
+                json.dump({table_info['name']: table_info for table_info in report['tables']},
+                          f, indent=2, ensure_ascii=False)
             
             # Save report to file
             report_filename = f"yogyakarta_tourism_data_catalog_report_{int(time.time())}.json"
@@ -421,6 +911,7 @@ class YogyakartaTourismDataCrawler:
             # Step 1: Verify S3 data structure
             print("\n1. Verifying S3 data structure...")
             self.verify_s3_data_structure()
+            self.validate_sampled_content()
             
             # Step 2: Create IAM role
             print("\n2. Setting up IAM role for crawler...")
@@ -432,6 +923,7 @@ class YogyakartaTourismDataCrawler:
             
             # Step 4: Create and configure crawler
             print("\n4. Creating Glue crawler...")
+            self.create_json_classifier()
             self.create_crawler_with_multiple_targets()
             
             # Step 5: Run crawler for schema discovery
@@ -0,0 +1,324 @@
+import hashlib
+import json
+import os
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+
+from aws_glue_crawler_implementation import YogyakartaTourismDataCrawler, iter_json_array_records
+
+# Widening order for numeric types when records disagree
+NUMERIC_TYPES = ['int', 'bigint', 'double']
+INT_MIN, INT_MAX = -2 ** 31, 2 ** 31 - 1
+
+
+class YogyakartaTourismSchemaInference:
+    def __init__(self, region_name='us-east-1', endpoint_url=None, crawler=None):
+        """
+        Infer per-source schemas from raw JSON and register them in the
+        Glue Data Catalog directly, without running the crawler
+        """
+        self.crawler = crawler or YogyakartaTourismDataCrawler(region_name=region_name, endpoint_url=endpoint_url)
+        self.glue_client = self.crawler.glue_client
+        self.database_name = self.crawler.database_name
+
+        # Storage settings matching what the crawler writes for JSON tables
+        self.partition_keys = [{'Name': 'scrape_date', 'Type': 'string'}]
+        self.input_format = 'org.apache.hadoop.mapred.TextInputFormat'
+        self.output_format = 'org.apache.hadoop.hive.ql.io.HiveIgnoreKeyTextOutputFormat'
+        self.serde_library = 'org.openx.data.jsonserde.JsonSerDe'
+        self.local_chunk_size = 1024 * 1024
+
+    def infer_type(self, value):
+        """
+        Infer the type tree of a single JSON value; None means unknown
+        """
+        if value is None:
+            return None
+        if isinstance(value, bool):
+            return ('boolean',)
+        if isinstance(value, int):
+            return ('int',) if INT_MIN <= value <= INT_MAX else ('bigint',)
+        if isinstance(value, float):
+            return ('double',)
+        if isinstance(value, str):
+            return ('string',)
+        if isinstance(value, dict):
+            return ('struct', {name: self.infer_type(field) for name, field in value.items()})
+        if isinstance(value, list):
+            element_type = None
+            for element in value:
+                element_type = self.merge_types(element_type, self.infer_type(element))
+            return ('array', element_type)
+        return ('string',)
+
+    def merge_types(self, left, right):
+        """
+        Merge two type trees into the narrowest type that holds both
+        """
+        if left is None:
+            return right
+        if right is None or left == right:
+            return left
+
+        if left[0] in NUMERIC_TYPES and right[0] in NUMERIC_TYPES:
+            return (max(left[0], right[0], key=NUMERIC_TYPES.index),)
+
+        if left[0] == 'struct' and right[0] == 'struct':
+            fields = dict(left[1])
+            for name, field_type in right[1].items():
+                fields[name] = self.merge_types(fields.get(name), field_type)
+            return ('struct', fields)
+
+        if left[0] == 'array' and right[0] == 'array':
+            return ('array', self.merge_types(left[1], right[1]))
+
+        # Incompatible shapes (e.g. string vs struct) fall back to string
+        return ('string',)
+
+    def render_type(self, type_tree):
+        """
+        Render a type tree as a Hive type string for the Data Catalog
+        """
+        if type_tree is None:
+            return 'string'
+        if type_tree[0] == 'struct':
+            fields = ','.join(f"{name}:{self.render_type(field)}" for name, field in type_tree[1].items())
+            return f"struct<{fields}>"
+        if type_tree[0] == 'array':
+            return f"array<{self.render_type(type_tree[1])}>"
+        return type_tree[0]
+
+    def _split_top_level(self, text, separator):
+        """
+        Split a type string on separators outside of any <...> nesting
+        """
+        parts, depth, start = [], 0, 0
+        for position, char in enumerate(text):
+            if char == '<':
+                depth += 1
+            elif char == '>':
+                depth -= 1
+            elif char == separator and depth == 0:
+                parts.append(text[start:position])
+                start = position + 1
+        parts.append(text[start:])
+        return parts
+
+    def parse_type(self, type_string):
+        """
+        Parse a Hive type string from the Data Catalog back into a type tree
+        """
+        type_string = type_string.strip()
+        lowered = type_string.lower()
+        if lowered.startswith('struct<') and type_string.endswith('>'):
+            fields = {}
+            body = type_string[len('struct<'):-1]
+            for field in self._split_top_level(body, ',') if body.strip() else []:
+                name, field_type = field.split(':', 1)
+                fields[name.strip()] = self.parse_type(field_type)
+            return ('struct', fields)
+        if lowered.startswith('array<') and type_string.endswith('>'):
+            return ('array', self.parse_type(type_string[len('array<'):-1]))
+        return (lowered,)
+
+    def infer_schema(self, records, schema=None):
+        """
+        Merge the types of a stream of records into one top-level struct
+        """
+        for record in records:
+            if isinstance(record, dict):
+                schema = self.merge_types(schema, self.infer_type(record))
+        return schema
+
+    def _iter_local_chunks(self, path):
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(self.local_chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def infer_from_local_file(self, path):
+        """
+        Stream a local raw JSON file and infer its schema
+        """
+        return self.infer_schema(iter_json_array_records(self._iter_local_chunks(path)))
+
+    def _infer_from_object(self, key, sample_size):
+        if sample_size:
+            records = self.crawler.sample_raw_records(key, sample_size)
+        else:
+            records = iter_json_array_records(self.crawler.iter_raw_object_chunks(key))
+        return self.infer_schema(records)
+
+    def infer_from_s3(self, source, sample_size=None):
+        """
+        Infer the schema of a source from all of its raw objects in S3,
+        reading only the first sample_size records of each when given
+        """
+        keys = [obj['Key'] for obj in self.crawler.list_raw_objects(source)]
+        schema = None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(len(keys), self.crawler.max_pool_connections))) as executor:
+            for object_schema in executor.map(lambda key: self._infer_from_object(key, sample_size), keys):
+                schema = self.merge_types(schema, object_schema)
+
+        return schema
+
+    def schema_columns(self, schema):
+        """
+        Turn an inferred top-level struct into catalog columns
+        """
+        if schema is None:
+            return []
+        return [{'Name': name, 'Type': self.render_type(field_type)} for name, field_type in schema[1].items()]
+
+    def schema_fingerprint(self, columns):
+        """
+        Stable hash of a column list, used to detect schema changes
+        """
+        payload = json.dumps([[c['Name'], c['Type']] for c in columns])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _table_input(self, source, columns):
+        table_name = f"{self.crawler.table_prefix}{source}"
+        return {
+            'Name': table_name,
+            'Description': f'Raw {source} scrapes, schema inferred offline',
+            'TableType': 'EXTERNAL_TABLE',
+            'PartitionKeys': self.partition_keys,
+            'Parameters': {
+                'classification': 'json',
+                'jsonPath': '$[*]',
+                'schema_fingerprint': self.schema_fingerprint(columns)
+            },
+            'StorageDescriptor': {
+                'Columns': columns,
+                'Location': self.crawler.s3_paths[source],
+                'InputFormat': self.input_format,
+                'OutputFormat': self.output_format,
+                'SerdeInfo': {'SerializationLibrary': self.serde_library}
+            }
+        }
+
+    def register_table(self, source, schema):
+        """
+        Create or update the catalog table of a source, only when merging
+        the inferred columns into the registered ones changes anything
+
+        Returns 'created', 'updated' or 'unchanged'.
+        """
+        columns = self.schema_columns(schema)
+        table_name = f"{self.crawler.table_prefix}{source}"
+
+        try:
+            existing = self.glue_client.get_table(DatabaseName=self.database_name, Name=table_name)['Table']
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'EntityNotFoundException':
+                raise
+            self.glue_client.create_table(DatabaseName=self.database_name,
+                                          TableInput=self._table_input(source, columns))
+            print(f"Created table {table_name} with {len(columns)} columns")
+            return 'created'
+
+        # Merge with the registered types so a sample never narrows a column
+        # (double -> int) or drops nested struct fields; columns missing from
+        # the sample are kept as they are
+        existing_columns = existing.get('StorageDescriptor', {}).get('Columns', [])
+        inferred_fields = dict(schema[1]) if schema else {}
+        merged_columns = []
+        for c in existing_columns:
+            merged = self.merge_types(self.parse_type(c['Type']), inferred_fields.pop(c['Name'], None))
+            merged_columns.append({'Name': c['Name'], 'Type': self.render_type(merged)})
+        columns = merged_columns + self.schema_columns(('struct', inferred_fields))
+
+        current = [{'Name': c['Name'], 'Type': c['Type']} for c in existing_columns]
+        if self.schema_fingerprint(current) == self.schema_fingerprint(columns):
+            print(f"Table {table_name} is up to date")
+            return 'unchanged'
+
+        current_types = {c['Name']: c['Type'] for c in current}
+        inferred_types = {c['Name']: c['Type'] for c in columns}
+        added = [name for name in inferred_types if name not in current_types]
+        changed = [name for name in inferred_types
+                   if name in current_types and current_types[name] != inferred_types[name]]
+
+        self.glue_client.update_table(DatabaseName=self.database_name,
+                                      TableInput=self._table_input(source, columns))
+        print(f"Updated table {table_name}: {len(added)} columns added, {len(changed)} columns changed")
+        for name in added:
+            print(f"  + {name}")
+        for name in changed:
+            print(f"  ~ {name}: {current_types[name]} -> {inferred_types[name]}")
+        return 'updated'
+
+    def register_partitions(self, source):
+        """
+        Register scrape_date partitions found in S3 that the catalog lacks
+        """
+        table_name = f"{self.crawler.table_prefix}{source}"
+        table = self.glue_client.get_table(DatabaseName=self.database_name, Name=table_name)['Table']
+
+        partition_values = set()
+        for obj in self.crawler.list_raw_objects(source):
+            folder = obj['Key'].split('/')[2]
+            if folder.startswith('scrape_date='):
+                partition_values.add(folder.split('=', 1)[1])
+
+        registered = {tuple(p['Values']) for p in self.crawler.get_table_partitions(table_name)}
+        missing = sorted(value for value in partition_values if (value,) not in registered)
+
+        storage_descriptor = dict(table['StorageDescriptor'])
+        partition_inputs = []
+        for value in missing:
+            partition_storage = dict(storage_descriptor, Location=f"{self.crawler.s3_paths[source]}scrape_date={value}/")
+            partition_inputs.append({'Values': [value], 'StorageDescriptor': partition_storage})
+
+        # batch_create_partition accepts at most 100 partitions per call
+        for start in range(0, len(partition_inputs), 100):
+            response = self.glue_client.batch_create_partition(
+                DatabaseName=self.database_name,
+                TableName=table_name,
+                PartitionInputList=partition_inputs[start:start + 100]
+            )
+            for error in response.get('Errors', []):
+                print(f"  Partition {error['PartitionValues']} failed: {error['ErrorDetail'].get('ErrorMessage')}")
+
+        print(f"Registered {len(missing)} new partitions for {table_name}")
+        return missing
+
+    def register_all_sources(self, sample_size=None, local_dir=None):
+        """
+        Infer and register every source, reading from local_dir when given
+        (files named as in source_files) or from S3 otherwise
+        """
+        results = {}
+
+        def infer(source):
+            if local_dir:
+                return self.infer_from_local_file(os.path.join(local_dir, self.crawler.source_files[source]))
+            return self.infer_from_s3(source, sample_size)
+
+        with ThreadPoolExecutor(max_workers=len(self.crawler.source_files)) as executor:
+            schemas = dict(zip(self.crawler.source_files, executor.map(infer, self.crawler.source_files)))
+
+        for source, schema in schemas.items():
+            if schema is None:
+                print(f"No records found for {source}, skipping")
+                continue
+            results[source] = self.register_table(source, schema)
+            self.register_partitions(source)
+
+        return results
+
+
+# Usage Example
+if __name__ == "__main__":
+    inference = YogyakartaTourismSchemaInference(region_name='us-east-1')  # Change region as needed
+
+    inference.crawler.create_glue_database()
+    results = inference.register_all_sources(sample_size=200)
+
+    print("\nSchema registration summary:")
+    for source, status in results.items():
+        print(f"  {source}: {status}")
@@ -0,0 +1,253 @@
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from aws_glue_crawler_implementation import YogyakartaTourismDataCrawler
+from aws_glue_schema_inference import YogyakartaTourismSchemaInference
+
+
+class YogyakartaTourismPipelineOrchestrator:
+    def __init__(self, region_name='us-east-1', endpoint_url=None, local_data_dir=None,
+                 state_path='yogyakarta_tourism_pipeline_state.json'):
+        """
+        Run upload -> schema -> ETL -> outputs as a DAG, skipping every stage
+        whose input fingerprint matches its last successful run
+        """
+        self.crawler = YogyakartaTourismDataCrawler(region_name=region_name, endpoint_url=endpoint_url)
+        self.schema_inference = YogyakartaTourismSchemaInference(crawler=self.crawler)
+        self.glue_client = self.crawler.glue_client
+        self.s3_client = self.crawler.s3_client
+
+        # Configuration
+        self.local_data_dir = local_data_dir
+        self.state_path = state_path
+        self.etl_job_name = 'yogyakarta-tourism-etl'
+        self.etl_script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixed_glue_etl_job.py')
+        # Passed to the job with --extra-py-files
+        self.etl_helpers_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tourism_etl_helpers.py')
+        self.etl_timeout = 3600
+        self.output_prefix = 'processed'
+        self.schema_sample_size = 200
+        self.max_workers = 8
+
+        self.stages = {}
+        self._raw_listing = None
+
+    def add_stage(self, name, run, inputs, depends_on=()):
+        """
+        Register a stage
+
+        run(upstream_outputs) returns the stage outputs and inputs() returns
+        the JSON-serialisable values the stage fingerprint is computed from.
+        Upstream outputs are part of the fingerprint as well, so a stage
+        reruns whenever anything it consumes changed.
+        """
+        self.stages[name] = {'run': run, 'inputs': inputs, 'depends_on': list(depends_on)}
+
+    def _hash(self, value):
+        payload = json.dumps(value, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _file_hash(self, path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _load_state(self):
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable pipeline state: {e}")
+            return {}
+
+    def _save_state(self, state):
+        # Write then rename, so a crash never leaves a half-written state file
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2, ensure_ascii=False, default=str)
+        os.replace(temp_path, self.state_path)
+
+    def _run_stage(self, name, previous, upstream_outputs, force):
+        """
+        Fingerprint a stage and run it unless its last successful run matches
+        """
+        stage = self.stages[name]
+        try:
+            fingerprint = self._hash({'inputs': stage['inputs'](), 'upstream': upstream_outputs})
+
+            if not force and previous and previous.get('fingerprint') == fingerprint:
+                print(f"[{name}] inputs unchanged, reusing outputs from {previous.get('completed_at')}")
+                return {'status': 'skipped', 'fingerprint': fingerprint, 'outputs': previous.get('outputs')}
+
+            print(f"[{name}] running...")
+            started = time.time()
+            outputs = stage['run'](upstream_outputs)
+            print(f"[{name}] finished in {time.time() - started:.1f}s")
+            return {'status': 'succeeded', 'fingerprint': fingerprint, 'outputs': outputs}
+
+        except Exception as e:
+            print(f"[{name}] failed: {e}")
+            return {'status': 'failed', 'error': str(e)}
+
+    def run(self, force=False):
+        """
+        Run all stages, independent ones concurrently, and persist the state
+        of every successful stage as soon as it completes
+        """
+        state = self._load_state()
+        self._raw_listing = None
+        results = {}
+        pending = dict(self.stages)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                for name in list(pending):
+                    dependencies = pending[name]['depends_on']
+                    if any(results.get(dep, {}).get('status') in ('failed', 'blocked') for dep in dependencies):
+                        print(f"[{name}] blocked by a failed upstream stage")
+                        results[name] = {'status': 'blocked'}
+                        del pending[name]
+                    elif all(results.get(dep, {}).get('status') in ('succeeded', 'skipped') for dep in dependencies):
+                        upstream_outputs = {dep: results[dep]['outputs'] for dep in dependencies}
+                        future = executor.submit(self._run_stage, name, state.get(name), upstream_outputs, force)
+                        running[future] = name
+                        del pending[name]
+
+                if not running:
+                    for name in pending:
+                        print(f"[{name}] has unknown or cyclic dependencies")
+                        results[name] = {'status': 'blocked'}
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+                    if results[name]['status'] == 'succeeded':
+                        state[name] = {
+                            'fingerprint': results[name]['fingerprint'],
+                            'outputs': results[name]['outputs'],
+                            'completed_at': time.strftime('%Y-%m-%d %H:%M:%S')
+                        }
+                        self._save_state(state)
+
+        print("\nPipeline run summary:")
+        for name in self.stages:
+            print(f"  {name}: {results[name]['status']}")
+
+        return results
+
+    def raw_object_etags(self):
+        """
+        ETags of every raw object per source, listed once per run
+        """
+        if self._raw_listing is None:
+            self._raw_listing = {
+                source: sorted((obj['Key'], obj['ETag']) for obj in self.crawler.list_raw_objects(source))
+                for source in self.crawler.source_files
+            }
+        return self._raw_listing
+
+    def _upload_stage(self, source, path):
+        def run(upstream_outputs):
+            return {'key': self.crawler.upload_raw_file(source, path)}
+
+        def inputs():
+            return {'source': source, 'sha256': self._file_hash(path)}
+
+        return run, inputs
+
+    def _run_schema_stage(self, upstream_outputs):
+        statuses = self.schema_inference.register_all_sources(sample_size=self.schema_sample_size)
+        schema_hashes = {}
+        for source in self.crawler.source_files:
+            table_name = f"{self.crawler.table_prefix}{source}"
+            table = self.glue_client.get_table(DatabaseName=self.crawler.database_name, Name=table_name)['Table']
+            columns = table.get('StorageDescriptor', {}).get('Columns', [])
+            schema_hashes[source] = self.schema_inference.schema_fingerprint(columns)
+        return {'statuses': statuses, 'schema_hashes': schema_hashes}
+
+    def wait_for_job_run(self, run_id):
+        """
+        Poll a Glue job run with the crawler's adaptive backoff settings
+        """
+        deadline = time.monotonic() + self.etl_timeout
+        delay = self.crawler.poll_initial_delay
+
+        while True:
+            job_run = self.glue_client.get_job_run(JobName=self.etl_job_name, RunId=run_id)['JobRun']
+            state = job_run['JobRunState']
+
+            if state == 'SUCCEEDED':
+                return job_run
+            if state in ('FAILED', 'STOPPED', 'TIMEOUT', 'ERROR'):
+                raise RuntimeError(f"Job run {run_id} ended in {state}: {job_run.get('ErrorMessage', '')}")
+            if time.monotonic() + delay > deadline:
+                raise TimeoutError(f"Job run {run_id} did not finish within {self.etl_timeout} seconds")
+
+            time.sleep(delay)
+            delay = min(delay * self.crawler.poll_backoff, self.crawler.poll_max_delay)
+
+    def _run_etl_stage(self, upstream_outputs):
+        run_id = self.glue_client.start_job_run(JobName=self.etl_job_name)['JobRunId']
+        print(f"Started Glue job {self.etl_job_name}: {run_id}")
+        job_run = self.wait_for_job_run(run_id)
+        return {'job_run_id': run_id, 'execution_time': job_run.get('ExecutionTime')}
+
+    def _run_outputs_stage(self, upstream_outputs):
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        manifest = {}
+        for page in paginator.paginate(Bucket=self.crawler.bucket_name, Prefix=f"{self.output_prefix}/"):
+            for obj in page.get('Contents', []):
+                manifest[obj['Key']] = obj['ETag']
+        print(f"Recorded {len(manifest)} processed output objects")
+        return {'objects': manifest}
+
+    def build_default_pipeline(self):
+        """
+        upload_<source> (when local_data_dir is set) -> schema -> etl -> outputs
+        """
+        upload_stages = []
+        if self.local_data_dir:
+            for source, file_name in self.crawler.source_files.items():
+                path = os.path.join(self.local_data_dir, file_name)
+                if not os.path.exists(path):
+                    continue
+                run, inputs = self._upload_stage(source, path)
+                self.add_stage(f"upload_{source}", run, inputs)
+                upload_stages.append(f"upload_{source}")
+
+        self.add_stage('schema', self._run_schema_stage,
+                       lambda: {'objects': self.raw_object_etags()},
+                       depends_on=upload_stages)
+        self.add_stage('etl', self._run_etl_stage,
+                       lambda: {'objects': self.raw_object_etags(),
+                                'code_version': [self._file_hash(self.etl_script_path),
+                                                 self._file_hash(self.etl_helpers_path)]},
+                       depends_on=['schema'])
+        self.add_stage('outputs', self._run_outputs_stage,
+                       lambda: {},
+                       depends_on=['etl'])
+        return self
+
+
+# Usage Example
+if __name__ == "__main__":
+    # Optional: directory with freshly scraped files named as in source_files
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else None
+
+    orchestrator = YogyakartaTourismPipelineOrchestrator(region_name='us-east-1', local_data_dir=data_dir)
+    results = orchestrator.build_default_pipeline().run(force='--force' in sys.argv)
+
+    if any(result['status'] in ('failed', 'blocked') for result in results.values()):
+        print("\nPipeline run failed. Please check the error messages above.")
+        sys.exit(1)
@@ -10,42 +10,420 @@ from awsglue.dynamicframe import DynamicFrame
 from pyspark.sql import DataFrame
 from pyspark.sql.functions import *
 from pyspark.sql.types import *
+from pyspark.sql.window import Window
+from pyspark.sql.utils import AnalysisException
+import hashlib
 import math
+import os
+import shutil
+import time
+import uuid
+from typing import Iterator, Tuple
+import pandas as pd
 
-# Initialize Glue context
-args = getResolvedOptions(sys.argv, ['JOB_NAME'])
-sc = SparkContext()
-glueContext = GlueContext(sc)
-spark = glueContext.spark_session
-job = Job(glueContext)
-job.init(args['JOB_NAME'], args)
+from tourism_etl_helpers import (OPENING_SLOTS_PER_DAY, admin_code, build_admin_region_index,
+                                 locate_admin_region, parse_opening_hours, summarize_opening_hours)
+
+# Versioned dictionary of Google Maps additionalInfo attributes. The list
+# position is the attribute id, so it is append-only: add new attributes at
+# the end and bump the version, never reorder or remove entries.
+ATTRACTION_ATTRIBUTE_DICTIONARY_VERSION = 1
+ATTRACTION_ATTRIBUTE_DICTIONARY = [
+    # Accessibility
+    ('Accessibility', 'Wheelchair accessible entrance'),
+    ('Accessibility', 'Wheelchair accessible parking lot'),
+    ('Accessibility', 'Wheelchair accessible restroom'),
+    ('Accessibility', 'Wheelchair accessible seating'),
+    ('Accessibility', 'Assistive hearing loop'),
+    ('Accessibility', 'Assisted listening devices'),
+    # Offerings
+    ('Offerings', 'Food'),
+    ('Offerings', 'Halal food'),
+    ('Offerings', 'Quick bite'),
+    ('Offerings', 'Coffee'),
+    ('Offerings', 'Beer'),
+    ('Offerings', 'Happy hour drinks'),
+    ('Offerings', 'Happy hour food'),
+    ('Offerings', 'Vegan options'),
+    ('Offerings', 'Vegetarian options'),
+    ('Offerings', 'Wine'),
+    ('Offerings', 'Late-night food'),
+    ('Offerings', 'Alcohol'),
+    ('Offerings', 'Cocktails'),
+    ('Offerings', 'Hard liquor'),
+    ('Offerings', 'Organic dishes'),
+    ('Offerings', 'Prepared foods'),
+    # Amenities
+    ('Amenities', 'Restaurant'),
+    ('Amenities', 'Restroom'),
+    ('Amenities', 'Wi-Fi'),
+    ('Amenities', 'Free Wi-Fi'),
+    ('Amenities', 'Gender-neutral restroom'),
+    ('Amenities', 'Bar onsite'),
+    ('Amenities', 'Public restroom'),
+    # Crowd
+    ('Crowd', 'Family-friendly'),
+    ('Crowd', 'College students'),
+    ('Crowd', 'Groups'),
+    ('Crowd', 'Tourists'),
+    # Children
+    ('Children', 'Good for kids'),
+    ('Children', 'Playground'),
+    ('Children', 'High chairs'),
+    ('Children', "Kids' menu"),
+    ('Children', 'Good for kids birthday'),
+    ('Children', 'Kid-friendly activities'),
+    # Service options
+    ('Service options', 'Outdoor seating'),
+    ('Service options', 'No-contact delivery'),
+    ('Service options', 'Delivery'),
+    ('Service options', 'Takeout'),
+    ('Service options', 'Dine-in'),
+    ('Service options', 'In-store pickup'),
+    ('Service options', 'Same-day delivery'),
+    ('Service options', 'Curbside pickup'),
+    ('Service options', 'Drive-through'),
+    ('Service options', 'Onsite services'),
+    ('Service options', 'In-store shopping'),
+    # Highlights
+    ('Highlights', 'Great tea selection'),
+    ('Highlights', 'Great coffee'),
+    ('Highlights', 'Great dessert'),
+    ('Highlights', 'Live music'),
+    ('Highlights', 'Great beer selection'),
+    ('Highlights', 'Great wine list'),
+    ('Highlights', 'Great cocktails'),
+    ('Highlights', 'Live performances'),
+    ('Highlights', 'Sports'),
+    ('Highlights', 'Great produce'),
+    # Popular for
+    ('Popular for', 'Lunch'),
+    ('Popular for', 'Dinner'),
+    ('Popular for', 'Solo dining'),
+    ('Popular for', 'Breakfast'),
+    ('Popular for', 'Good for working on laptop'),
+    # Dining options
+    ('Dining options', 'Lunch'),
+    ('Dining options', 'Dinner'),
+    ('Dining options', 'Seating'),
+    ('Dining options', 'Breakfast'),
+    ('Dining options', 'Brunch'),
+    ('Dining options', 'Catering'),
+    ('Dining options', 'Dessert'),
+    ('Dining options', 'Counter service'),
+    # Atmosphere
+    ('Atmosphere', 'Casual'),
+    ('Atmosphere', 'Cozy'),
+    ('Atmosphere', 'Quiet'),
+    ('Atmosphere', 'Trendy'),
+    ('Atmosphere', 'Romantic'),
+    ('Atmosphere', 'Upscale'),
+    # Planning
+    ('Planning', 'Accepts reservations'),
+    ('Planning', 'Quick visit'),
+    ('Planning', 'Brunch reservations recommended'),
+    ('Planning', 'Lunch reservations recommended'),
+    ('Planning', 'Dinner reservations recommended'),
+    ('Planning', 'Usually a wait'),
+    ('Planning', 'Appointment required'),
+    ('Planning', 'Getting tickets in advance recommended'),
+    # Payments
+    ('Payments', 'Credit cards'),
+    ('Payments', 'Debit cards'),
+    ('Payments', 'Cash-only'),
+    ('Payments', 'NFC mobile payments'),
+    ('Payments', 'Meal coupons'),
+    ('Payments', 'Checks'),
+    # Parking
+    ('Parking', 'Free parking lot'),
+    ('Parking', 'Free street parking'),
+    ('Parking', 'Paid parking lot'),
+    ('Parking', 'Paid street parking'),
+    ('Parking', 'Free parking garage'),
+    ('Parking', 'On-site parking'),
+    ('Parking', 'Valet parking'),
+    ('Parking', 'Paid parking garage'),
+    # From the business
+    ('From the business', 'Identifies as women-owned'),
+    # Pets
+    ('Pets', 'Dogs allowed'),
+    ('Pets', 'Dogs allowed outside'),
+]
+# 63 bits per word keeps every mask word a non-negative bigint
+ATTRIBUTE_BITS_PER_WORD = 63
+
+# Where each dataset keeps its per-category ratings: (array column, name
+# field, score field, multiplier onto the 0-10 scale). TripAdvisor scores
+# are 1-5 bubbles, Booking.com scores are already 0-10.
+CATEGORY_RATING_SOURCES = {
+    'booking_reviews': ('hotelRatingScores', 'codeName', 'score', 1.0),
+    'booking_hotels': ('categoryReviews', 'title', 'score', 1.0),
+    'tripadvisor_reviews': ('subratings', 'name', 'value', 2.0),
+}
+
+# TripAdvisor hotel categoryReviewScores holds a single overall entry labelled
+# like "4,8 dari 5 lingkaran" (the scrape uses the Indonesian site), so it is
+# read as overall_bubble_score rather than as category scores
+BUBBLE_SCORE_SOURCE = ('categoryReviewScores', 'categoryName', 'score')
+
+# Output column -> lower-cased category names per platform. Columns without
+# names for a platform stay null for that platform. Booking hotel titles come
+# from the lang=id scrape, review codeNames are language independent.
+CATEGORY_RATING_COLUMNS = {
+    'staff_score': {'booking': ['hotel_staff', 'staff', 'staf'], 'tripadvisor': ['service']},
+    'facilities_score': {'booking': ['hotel_services', 'facilities', 'fasilitas'], 'tripadvisor': []},
+    'cleanliness_score': {'booking': ['hotel_clean', 'cleanliness', 'kebersihan'], 'tripadvisor': ['cleanliness']},
+    'comfort_score': {'booking': ['hotel_comfort', 'comfort', 'kenyamanan'], 'tripadvisor': []},
+    'value_for_money_score': {'booking': ['hotel_value', 'value for money', 'sesuai harga'],
+                              'tripadvisor': ['value']},
+    'location_score': {'booking': ['hotel_location', 'location', 'lokasi'], 'tripadvisor': ['location']},
+    'free_wifi_score': {'booking': ['hotel_free_wifi', 'free wifi', 'wifi gratis'], 'tripadvisor': []},
+    'rooms_score': {'booking': [], 'tripadvisor': ['rooms']},
+    'sleep_quality_score': {'booking': [], 'tripadvisor': ['sleep quality']},
+}
+
+# Star-count histograms: dataset -> (struct column, field per star 1-5)
+RATING_HISTOGRAM_SOURCES = {
+    'tripadvisor_hotels': ('ratingHistogram', ['count1', 'count2', 'count3', 'count4', 'count5']),
+    'geospatial_attractions': ('reviewsDistribution', ['oneStar', 'twoStar', 'threeStar', 'fourStar', 'fiveStar']),
+}
+
+# Hotel region (province) sources, first populated wins: (struct column,
+# field) pairs, with None for a top-level column. Booking keeps the region in
+# its address struct; the TripAdvisor scrape leaves addressObj city and state
+# null, so its region comes from the region-level ancestorLocations entry.
+HOTEL_REGION_SOURCES = {
+    'booking_hotels': [('address', 'region'), (None, 'state')],
+    'tripadvisor_hotels': [('addressObj', 'state'), (None, 'state')],
+}
+# (array column, name field, subcategory field, region-level subcategories)
+HOTEL_REGION_ANCESTOR_SOURCE = ('ancestorLocations', 'name', 'subcategory',
+                                ['wilayah', 'provinsi', 'region', 'province'])
+
+# Bump when stage outputs change shape, so old checkpoints are not resumed
+CHECKPOINT_FORMAT_VERSION = 1
+
+# Booking's generated letter avatars; these are not an uploaded photo
+BOOKING_DEFAULT_AVATAR_PATH = '/static/img/review/avatars/ava-'
 
 class YogyakartaTourismETL:
-    def __init__(self, glue_context, spark_session):
+    def __init__(self, glue_context, spark_session, sample_fraction=None, sample_seed=42,
+                 run_id=None, checkpoint_root=None):
         self.glueContext = glue_context
         self.spark = spark_session
         
+        # Sampling mode for dev/CI runs: a reproducible stratified sample of
+        # the source records, written under sample/ instead of the real outputs
+        self.sample_fraction = sample_fraction
+        self.sample_seed = sample_seed
+        
         # Configuration - Fixed output prefix
         self.database_name = "yogyakarta_tourism_db"
-        self.source_table = "yogya_tourism_raw_json"
+        # Per-source tables registered by the crawler over raw-json/<source>/
+        self.source_tables = {
+            'booking_hotels': "yogya_tourism_booking_hotels",
+            'booking_reviews': "yogya_tourism_booking_reviews",
+            'tripadvisor_hotels': "yogya_tourism_tripadvisor_hotels",
+            'tripadvisor_reviews': "yogya_tourism_tripadvisor_reviews",
+            'geospatial_attractions': "yogya_tourism_geospatial_attractions"
+        }
         self.output_bucket = "rdv-apify-storage"
         self.output_prefix = "processed"  # Fixed from "processed-data" to "processed"
+        self.quarantine_prefix = "quarantine"
+        if self.sample_fraction:
+            self.output_prefix = f"sample/{self.output_prefix}"
+            self.quarantine_prefix = f"sample/{self.quarantine_prefix}"
         
-    def read_source_data(self):
+        # Administrative regions (kecamatan, within kabupaten/kota) from a
+        # GeoJSON boundary file; codes follow the HDX COD-AB property names
+        self.admin_boundaries_path = "diy_admin_boundaries.geojson"
+        self.admin_code_property = "ADM3_PCODE"
+        self.admin_name_property = "ADM3_EN"
+        self.admin_parent_code_property = "ADM2_PCODE"
+        self.admin_parent_name_property = "ADM2_EN"
+        self.admin_index_cell_degrees = 0.01
+        self.admin_enriched_datasets = ['booking_hotels', 'tripadvisor_hotels', 'geospatial_attractions']
+        
+        # Stage checkpoints, one directory per input fingerprint, so a rerun
+        # over the same inputs resumes from the first incomplete stage.
+        # checkpoint_root may be an s3:// URI or a local path.
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.checkpoint_root = checkpoint_root or (
+            f"s3://{self.output_bucket}/{'sample/' if self.sample_fraction else ''}staging/etl")
+        self.checkpoint = None
+        
+        # Approximate bounding box of Daerah Istimewa Yogyakarta
+        self.diy_bounds = {
+            'lat_min': -8.25, 'lat_max': -7.50,
+            'lng_min': 110.00, 'lng_max': 110.90
+        }
+        
+        # Hotel-attraction distance pairs are kept within this radius
+        self.distance_radius_km = 10.0
+        
+        # Sampling grid, with cells at least distance_radius_km wide anywhere
+        # in the bounding box, so every attraction in range of a sampled hotel
+        # lies in the hotel's cell or one of its 8 neighbours. Longitude
+        # degrees are narrowest at the bound farthest from the equator
+        # (min/max/abs are shadowed by pyspark.sql.functions in this module)
+        narrowest_cos = sorted(math.cos(math.radians(self.diy_bounds[bound])) for bound in ('lat_min', 'lat_max'))[0]
+        self.sample_cell_degrees = self.distance_radius_km / (111.32 * narrowest_cos)
+        
+        # Declarative data quality rules per transformed dataset
+        self.quality_rules = {
+            'booking_hotels': [
+                ('required', ['booking_hotel_id', 'hotel_name']),
+                ('in_bounds', ('latitude', 'longitude')),
+                ('range', 'stars', 0, 5),
+                ('range', 'rating', 0, 10),
+                ('unique', 'booking_hotel_id')
+            ],
+            'booking_reviews': [
+                ('required', ['review_id', 'booking_hotel_id', 'rating']),
+                ('range', 'rating', 0, 10),
+                ('parseable_date', 'check_in_date', '_raw_check_in_date'),
+                ('parseable_date', 'check_out_date', '_raw_check_out_date'),
+                ('parseable_date', 'review_date', '_raw_review_date'),
+                ('unique', 'review_id')
+            ],
+            'tripadvisor_hotels': [
+                ('required', ['tripadvisor_location_id', 'hotel_name']),
+                ('in_bounds', ('latitude', 'longitude')),
+                ('range', 'rating', 0, 5),
+                ('unique', 'tripadvisor_location_id')
+            ],
+            'tripadvisor_reviews': [
+                ('required', ['review_id', 'tripadvisor_location_id', 'rating']),
+                ('range', 'rating', 0, 5),
+                ('parseable_date', 'published_date', '_raw_published_date'),
+                ('unique', 'review_id')
+            ],
+            'geospatial_attractions': [
+                ('required', ['place_id', 'attraction_name', 'latitude', 'longitude']),
+                ('in_bounds', ('latitude', 'longitude')),
+                ('range', 'rating', 0, 5),
+                ('unique', 'place_id')
+            ]
+        }
+        self.quality_metrics = {}
+        self.quarantine_data = {}
+        # Quality-flagged frames kept cached for the pass/quarantine split
+        self.quality_cached = {}
+        self.category_dictionary_updates = []
+        
+        # Rollup cubes for dashboards. Fixed-width rating histograms merge by
+        # adding bins, so they act as the quantile sketch for bounded ratings.
+        self.rollup_prefix = f"{self.output_prefix}/rollups"
+        self.rating_histogram_bin_width = 0.25
+        self.rating_histogram_bins = 41  # 0 to 10 inclusive
+        self.rollup_quantiles = {'rating_p25': 0.25, 'rating_p50': 0.5, 'rating_p75': 0.75, 'rating_p90': 0.9}
+        self.admin_code_columns = ["admin_parent_code", "admin_region_code"]
+        # Incremental review cubes and their keys: by the scraped region
+        # name, and by the administrative region codes
+        self.review_cubes = {
+            'review_rollup': ["platform", "region", "accommodation_type", "month"],
+            'review_admin_rollup': ["platform", "admin_parent_code", "admin_region_code",
+                                    "accommodation_type", "month"]
+        }
+        
+        # Review keys already added to an incremental aggregate, one key set
+        # per consumer; re-scraped reviews come back on every scrape
+        self.counted_keys_prefix = f"{self.rollup_prefix}/_counted_keys"
+        self.review_key_columns = ["platform", "review_id"]
+        
+        # Hot/cold split: wide free-text columns are written to a separate
+        # <dataset>_text table keyed by the dataset id, so scans, joins and
+        # shuffles over the hot table never carry them
+        self.cold_table_suffix = "_text"
+        self.cold_columns = {
+            'booking_hotels': ('booking_hotel_id', ['description', 'full_address', 'street_address',
+                                                   'booking_url', 'facilities']),
+            'booking_reviews': ('review_id', ['review_title', 'liked_text', 'disliked_text', 'room_info']),
+            'tripadvisor_hotels': ('tripadvisor_location_id', ['description', 'full_address', 'street_address',
+                                                               'website', 'email', 'amenities']),
+            'tripadvisor_reviews': ('review_id', ['review_title', 'review_text']),
+            'geospatial_attractions': ('place_id', ['full_address', 'opening_hours'])
+        }
+        
+        # SCD type-2 snapshots: dataset -> (key column, tracked attributes).
+        # Each dataset keeps current/ (the open version of every key, rewritten
+        # each run) and closed/ (superseded versions with valid_to, appended).
+        self.snapshot_prefix = f"{self.output_prefix}/snapshots"
+        self.snapshot_tracked_attributes = {
+            'booking_hotels': ('booking_hotel_id', ['price', 'currency', 'rating', 'reviews', 'stars']),
+            'tripadvisor_hotels': ('tripadvisor_location_id', ['price_level', 'price_range', 'rating',
+                                                               'reviews_count', 'hotel_class', 'ranking_position']),
+            'geospatial_attractions': ('place_id', ['rating', 'reviews_count', 'permanently_closed',
+                                                    'temporarily_closed'])
+        }
+        self.snapshot_compaction_file_threshold = 32
+        self.snapshot_compacted_files = 4
+        
+        # Reviewer dimension: attributes moved off the review facts, and the
+        # review date column of each review dataset
+        self.reviewer_prefix = f"{self.output_prefix}/reviewers"
+        self.reviewer_attributes = ['reviewer_name', 'reviewer_location', 'reviewer_avatar_url',
+                                    'platform_user_id', 'total_contributions', 'reviewer_helpful_votes']
+        self.review_datasets = {'booking_reviews': 'review_date', 'tripadvisor_reviews': 'published_date'}
+        
+        # Review dataset and hotel id column per platform, for the cubes
+        self.hotel_dimensions = {
+            'booking_hotels': ('booking_reviews', 'booking_hotel_id'),
+            'tripadvisor_hotels': ('tripadvisor_reviews', 'tripadvisor_location_id')
+        }
+        
+    def get_source_locations(self):
         """
-        Read data from Glue Data Catalog
+        Look up the S3 location of every per-source table in the Data Catalog
         """
-        print("Reading source data from Glue Data Catalog...")
+        glue_client = boto3.client('glue')
+        locations = []
         
-        # Create dynamic frame from catalog
-        dynamic_frame = self.glueContext.create_dynamic_frame.from_catalog(
-            database=self.database_name,
-            table_name=self.source_table,
+        for source, table_name in self.source_tables.items():
+            try:
+                table = glue_client.get_table(DatabaseName=self.database_name, Name=table_name)['Table']
+                locations.append(table['StorageDescriptor']['Location'])
+            except glue_client.exceptions.EntityNotFoundException:
+                print(f"Table {table_name} not found in catalog, skipping {source}")
+        
+        return locations
+    
+    def source_dynamic_frame(self, source_locations):
+        """
+        Bookmark-scoped dynamic frame over all source locations
+        """
+        # Read all per-source locations into one dynamic frame, so conflicting
+        # field types across sources still resolve into choice columns. Each
+        # file is a top-level JSON array, one record per element.
+        return self.glueContext.create_dynamic_frame.from_options(
+            connection_type="s3",
+            connection_options={"paths": source_locations, "recurse": True, "attachFilename": "source_file"},
+            format="json",
+            format_options={"jsonPath": "$[*]", "multiline": True},
             transformation_ctx="source_data"
         )
+    
+    def read_source_data(self):
+        """
+        Read the raw files under the catalog tables' locations
+
+        The files are read directly rather than through the catalog, so
+        which scrape_date partitions are processed is decided by the job
+        bookmark alone: with bookmarks disabled every partition is re-read.
+        The scrape_date partition value is recovered from each file path.
+        """
+        print("Reading source data from Glue Data Catalog...")
+        
+        source_locations = self.get_source_locations()
+        print(f"Reading {len(source_locations)} source locations: {source_locations}")
+        
+        dynamic_frame = self.source_dynamic_frame(source_locations)
         
         # Convert to Spark DataFrame for easier manipulation
         df = dynamic_frame.toDF()
+        partition_value = regexp_extract(col("source_file"), r"scrape_date=(\d{4}-\d{2}-\d{2})", 1)
+        df = df.withColumn("scrape_date", when(partition_value != "", to_date(partition_value))) \
+               .drop("source_file")
         
         print(f"Source data loaded. Total records: {df.count()}")
         print("DataFrame schema:")
@@ -66,11 +444,11 @@ class YogyakartaTourismETL:
             exploded_df = df.withColumn("row_id", monotonically_increasing_id())
         else:
             # Explode the array to work with individual records
-            exploded_df = df.select(explode(col("array")).alias("record"))
+            exploded_df = df.select(explode(col("array")).alias("record"), col("scrape_date"))
             # Add row numbers for tracking
             exploded_df = exploded_df.withColumn("row_id", monotonically_increasing_id())
             # Flatten the record structure
-            exploded_df = exploded_df.select(col("row_id"), col("record.*"))
+            exploded_df = exploded_df.select(col("row_id"), col("scrape_date"), col("record.*"))
         
         # Identify record types based on available fields
         identified_df = exploded_df.withColumn(
@@ -108,6 +486,163 @@ class YogyakartaTourismETL:
         
         return identified_df
     
+    def _compile_quality_rule(self, rule):
+        """
+        Turn a declarative rule into (reason_code, failure_condition) pairs
+        """
+        rule_type = rule[0]
+        
+        if rule_type == 'required':
+            return [(f"missing_{column}", col(column).isNull()) for column in rule[1]]
+        
+        if rule_type == 'in_bounds':
+            lat_column, lng_column = rule[1]
+            bounds = self.diy_bounds
+            return [
+                (f"out_of_bounds_{lat_column}",
+                 col(lat_column).isNotNull() & ~col(lat_column).between(bounds['lat_min'], bounds['lat_max'])),
+                (f"out_of_bounds_{lng_column}",
+                 col(lng_column).isNotNull() & ~col(lng_column).between(bounds['lng_min'], bounds['lng_max']))
+            ]
+        
+        if rule_type == 'range':
+            _, column, low, high = rule
+            return [(f"out_of_range_{column}", col(column).isNotNull() & ~col(column).between(low, high))]
+        
+        if rule_type == 'parseable_date':
+            # Raw string was present but the parsed date came out null
+            _, column, raw_column = rule
+            return [(f"unparseable_{column}", col(raw_column).isNotNull() & col(column).isNull())]
+        
+        if rule_type == 'unique':
+            # Keep the latest scrape of each key, flag older copies as duplicates
+            column = rule[1]
+            occurrence = row_number().over(Window.partitionBy(col(column)).orderBy(
+                col("scraped_at").desc_nulls_last(), col("source_row_id")))
+            return [(f"duplicate_{column}", col(column).isNotNull() & (occurrence > 1))]
+        
+        raise ValueError(f"Unknown quality rule type: {rule_type}")
+    
+    def apply_quality_rules(self, dataset_name, df):
+        """
+        Evaluate all quality rules of a dataset in one projection, route failing
+        rows to quarantine and aggregate per-rule pass rates in a single pass
+        """
+        checks = []
+        for rule in self.quality_rules.get(dataset_name, []):
+            checks.extend(self._compile_quality_rule(rule))
+        
+        raw_columns = [c for c in df.columns if c.startswith("_raw_")]
+        if not checks:
+            return df.drop(*raw_columns)
+        
+        # Every failed rule contributes its reason code, passing rules contribute null
+        failures = filter(
+            array(*[when(condition, lit(code)) for code, condition in checks]),
+            lambda code: code.isNotNull()
+        )
+        flagged = df.withColumn("quality_failures", failures).drop(*raw_columns).cache()
+        self.quality_cached[dataset_name] = flagged
+        
+        # One aggregation for all rules instead of one job per rule
+        metrics_row = flagged.agg(
+            count(lit(1)).alias("total_records"),
+            sum(when(size(col("quality_failures")) > 0, 1).otherwise(0)).alias("quarantined_records"),
+            *[sum(when(array_contains(col("quality_failures"), code), 1).otherwise(0)).alias(code)
+              for code, _ in checks]
+        ).collect()[0]
+        
+        total = metrics_row["total_records"]
+        quarantined = metrics_row["quarantined_records"] or 0
+        self.quality_metrics[dataset_name] = {
+            'total_records': total,
+            'passed_records': total - quarantined,
+            'quarantined_records': quarantined,
+            'rule_pass_rates': {
+                code: (1.0 - (metrics_row[code] or 0) / total) if total else 1.0
+                for code, _ in checks
+            }
+        }
+        
+        print(f"Quality check for {dataset_name}: {quarantined} of {total} records quarantined")
+        for code, pass_rate in self.quality_metrics[dataset_name]['rule_pass_rates'].items():
+            if pass_rate < 1.0:
+                print(f"  {code}: {pass_rate:.2%} pass rate")
+        
+        if quarantined:
+            self.quarantine_data[dataset_name] = flagged.filter(size(col("quality_failures")) > 0)
+        
+        return flagged.filter(size(col("quality_failures")) == 0).drop("quality_failures")
+    
+    def release_quality_cache(self, dataset_name=None):
+        """
+        Unpersist the cached quality-flagged frame of a dataset, or of all
+        datasets, once nothing reads the passed and quarantined rows from it
+        """
+        names = [dataset_name] if dataset_name else list(self.quality_cached)
+        for name in names:
+            flagged = self.quality_cached.pop(name, None)
+            if flagged is not None:
+                flagged.unpersist()
+    
+    def _sampled(self, key_column):
+        """
+        Deterministic per-key sampling decision for the configured fraction and seed
+        """
+        bucket = pmod(xxhash64(key_column, lit(self.sample_seed)), lit(1000000))
+        return bucket < lit(int(self.sample_fraction * 1000000))
+    
+    def sample_identified_data(self, df):
+        """
+        Reproducible stratified sample of the identified records
+
+        Hotels are sampled per data_source_type by hotel id and their reviews
+        follow with the same id, so reviews stay attached to their hotels.
+        Attractions are sampled by place id, plus every attraction within
+        distance_radius_km of a sampled hotel (found through the 3x3 grid
+        cells around it), so sampled hotels keep all their distance pairs.
+        """
+        print(f"Sampling {self.sample_fraction:.1%} of source records (seed {self.sample_seed})...")
+        
+        source_type = col("data_source_type")
+        hotel_key = when(source_type.isin("booking_hotel", "booking_review"),
+                         concat(lit("booking:"), col("hotelId").cast("string"))) \
+            .when(source_type.isin("tripadvisor_hotel", "tripadvisor_review"),
+                  concat(lit("tripadvisor:"), col("locationId").cast("string")))
+        latitude = coalesce(col("latitude").cast("double"), col("location.lat").cast("double"))
+        longitude = coalesce(col("longitude").cast("double"), col("location.lng").cast("double"))
+        cell_columns = ["_sample_cell_lat", "_sample_cell_lng"]
+        
+        keyed = df.withColumn("_sample_key", coalesce(
+            hotel_key,
+            when(source_type == "geospatial_attraction", concat(lit("place:"), col("placeId").cast("string"))),
+            concat(lit("row:"), col("row_id").cast("string"))
+        )).withColumn("_sample_cell_lat", floor(latitude / self.sample_cell_degrees)) \
+          .withColumn("_sample_cell_lng", floor(longitude / self.sample_cell_degrees))
+        keyed = keyed.withColumn("_sample_keep", self._sampled(col("_sample_key")))
+        
+        # Cells around sampled hotels: a pair within the radius can straddle
+        # a cell boundary, but never spans more than one cell
+        offsets = array(*[lit(offset) for offset in (-1, 0, 1)])
+        hotel_cells = keyed.filter(source_type.isin("booking_hotel", "tripadvisor_hotel") & col("_sample_keep")
+                                   & col("_sample_cell_lat").isNotNull() & col("_sample_cell_lng").isNotNull()) \
+                           .select(*cell_columns).distinct() \
+                           .withColumn("_lat_offset", explode(offsets)) \
+                           .withColumn("_lng_offset", explode(offsets)) \
+                           .select((col("_sample_cell_lat") + col("_lat_offset")).alias("_sample_cell_lat"),
+                                   (col("_sample_cell_lng") + col("_lng_offset")).alias("_sample_cell_lng"),
+                                   lit(True).alias("_near_sampled_hotel")) \
+                           .distinct()
+        
+        sampled = keyed.join(broadcast(hotel_cells), cell_columns, "left").filter(
+            col("_sample_keep") |
+            ((source_type == "geospatial_attraction") & coalesce(col("_near_sampled_hotel"), lit(False)))
+        ).drop("_sample_key", "_sample_keep", "_near_sampled_hotel", *cell_columns)
+        
+        counts = {row['data_source_type']: row['count'] for row in sampled.groupBy("data_source_type").count().collect()}
+        print(f"Sampled records per source type: {counts}")
+        return sampled
+    
     def transform_booking_hotels(self, df):
         """
         Transform Booking.com hotel data
@@ -141,7 +676,7 @@ class YogyakartaTourismETL:
             col("address").alias("full_address"),
             col("street").alias("street_address"),
             col("countryCode").alias("country"),
-            col("state").alias("region"),
+            self.region_column(booking_hotels, 'booking_hotels').alias("region"),
             col("postalCode").alias("postal_code"),
             
             # Operational info
@@ -153,14 +688,39 @@ class YogyakartaTourismETL:
             # Facilities (will be processed separately)
             col("facilities"),
             
+            # Scrape time, for the attribute snapshots; falls back to the
+            # scrape_date partition, then to the run time
+            coalesce(to_timestamp(col("timeOfScrapeISO")), col("scrape_date").cast("timestamp"),
+                     current_timestamp()).alias("scraped_at"),
+            
+            # Category review scores
+            *self.category_rating_columns(booking_hotels, 'booking_hotels'),
+            
             # Metadata
             lit("booking.com").alias("platform"),
             current_timestamp().alias("processed_at")
         )
         
-        print(f"Transformed {transformed.count()} booking hotel records")
+        transformed = self.apply_quality_rules('booking_hotels', transformed)
+        
+        print(f"Transformed {self.quality_metrics['booking_hotels']['passed_records']} booking hotel records")
         return transformed
     
+    def booking_reviewer_id(self):
+        """
+        Booking exposes no user id, so reviewers are identified by name,
+        location and uploaded avatar
+
+        Reviewers without a photo get a letter avatar (avatars/ava-s.png)
+        shared by everyone whose name starts with that letter, so it is left
+        out of the key. Those reviewers are identified by name and location
+        only, and different people sharing both are merged into one.
+        """
+        custom_avatar = when(~col("userAvatar").contains(BOOKING_DEFAULT_AVATAR_PATH), col("userAvatar"))
+        return when(col("userName").isNotNull(),
+                    xxhash64(lit("booking.com"), lower(trim(col("userName"))), lower(trim(col("userLocation"))),
+                             custom_avatar)).alias("reviewer_id")
+    
     def transform_booking_reviews(self, df):
         """
         Transform Booking.com review data
@@ -184,8 +744,16 @@ class YogyakartaTourismETL:
             col("likedText").alias("liked_text"),
             col("dislikedText").alias("disliked_text"),
             col("travelerType").alias("traveler_type"),
-            col("userLocation").alias("user_location"),
-            col("userName").alias("user_name"),
+            
+            # Reviewer, split into the reviewers dimension after the transforms
+            self.booking_reviewer_id(),
+            col("userName").alias("reviewer_name"),
+            col("userLocation").alias("reviewer_location"),
+            col("userAvatar").alias("reviewer_avatar_url"),
+            lit(None).cast("string").alias("platform_user_id"),
+            lit(None).cast("integer").alias("total_contributions"),
+            lit(None).cast("integer").alias("reviewer_helpful_votes"),
+            
             when(col("numberOfNights").isNotNull(), col("numberOfNights").cast("integer")).alias("number_of_nights"),
             col("roomInfo").alias("room_info"),
             when(col("helpfulVotes").isNotNull(), col("helpfulVotes").cast("integer")).alias("helpful_votes"),
@@ -197,17 +765,27 @@ class YogyakartaTourismETL:
             when(col("checkOutDate").isNotNull(), 
                  to_date(col("checkOutDate"), "yyyy-MM-dd")).alias("check_out_date"),
             when(col("reviewDate").isNotNull(), 
-                 to_date(col("reviewDate"), "yyyy-MM-dd")).alias("review_date"),
+                 to_date(substring(col("reviewDate"), 1, 10), "yyyy-MM-dd")).alias("review_date"),
+            
+            # Raw date strings, only kept for the parseable_date quality rules
+            col("checkInDate").alias("_raw_check_in_date"),
+            col("checkOutDate").alias("_raw_check_out_date"),
+            col("reviewDate").alias("_raw_review_date"),
             
-            # Rating scores (will be processed separately)
-            col("hotelRatingScores").alias("category_ratings"),
+            # Scrape time from the scrape_date partition, to keep the latest copy of a review
+            coalesce(col("scrape_date").cast("timestamp"), current_timestamp()).alias("scraped_at"),
+            
+            # Category rating scores
+            *self.category_rating_columns(booking_reviews, 'booking_reviews'),
             
             # Metadata
             lit("booking.com").alias("platform"),
             current_timestamp().alias("processed_at")
         )
         
-        print(f"Transformed {transformed.count()} booking review records")
+        transformed = self.apply_quality_rules('booking_reviews', transformed)
+        
+        print(f"Transformed {self.quality_metrics['booking_reviews']['passed_records']} booking review records")
         return transformed
     
     def transform_tripadvisor_hotels(self, df):
@@ -241,6 +819,7 @@ class YogyakartaTourismETL:
             col("street").alias("street_address"),
             col("city"),
             col("state"),
+            self.region_column(ta_hotels, 'tripadvisor_hotels').alias("region"),
             col("countryCode").alias("country"),
             col("postalCode").alias("postal_code"),
             
@@ -259,12 +838,22 @@ class YogyakartaTourismETL:
             when(col("photoCount").isNotNull(), col("photoCount").cast("integer")).alias("photo_count"),
             col("amenities"),
             
+            # Overall bubble score and star-count histogram
+            self.bubble_score_column(ta_hotels).alias("overall_bubble_score"),
+            *self.rating_histogram_columns(ta_hotels, 'tripadvisor_hotels'),
+            
+            # TripAdvisor records carry no scrape time, so the scrape_date
+            # partition is used, and the run time only without one
+            coalesce(col("scrape_date").cast("timestamp"), current_timestamp()).alias("scraped_at"),
+            
             # Metadata
             lit("tripadvisor.com").alias("platform"),
             current_timestamp().alias("processed_at")
         )
         
-        print(f"Transformed {transformed.count()} TripAdvisor hotel records")
+        transformed = self.apply_quality_rules('tripadvisor_hotels', transformed)
+        
+        print(f"Transformed {self.quality_metrics['tripadvisor_hotels']['passed_records']} TripAdvisor hotel records")
         return transformed
     
     def transform_tripadvisor_reviews(self, df):
@@ -291,26 +880,41 @@ class YogyakartaTourismETL:
             col("lang").alias("review_language"),
             col("tripType").alias("trip_type"),
             
-            # User info - handle nested user structure
-            col("user.name").alias("user_name"),
-            col("user.userLocation.name").alias("user_location"),
+            # Reviewer, split into the reviewers dimension after the transforms
+            when(col("user.userId").isNotNull(),
+                 xxhash64(lit("tripadvisor.com"), col("user.userId"))).alias("reviewer_id"),
+            col("user.name").alias("reviewer_name"),
+            col("user.userLocation.name").alias("reviewer_location"),
+            col("user.avatar.image").alias("reviewer_avatar_url"),
+            col("user.userId").alias("platform_user_id"),
             when(col("user.contributions.totalContributions").isNotNull(), 
-                 col("user.contributions.totalContributions").cast("integer")).alias("user_total_contributions"),
+                 col("user.contributions.totalContributions").cast("integer")).alias("total_contributions"),
+            when(col("user.contributions.helpfulVotes").isNotNull(), 
+                 col("user.contributions.helpfulVotes").cast("integer")).alias("reviewer_helpful_votes"),
             
             # Date info - handle various date formats
             when(col("publishedDate").isNotNull(), 
                  to_date(col("publishedDate"), "yyyy-MM-dd")).alias("published_date"),
             col("travelDate").alias("travel_date"),
+            col("publishedDate").alias("_raw_published_date"),
+            
+            # Scrape time from the scrape_date partition, to keep the latest copy of a review
+            coalesce(col("scrape_date").cast("timestamp"), current_timestamp()).alias("scraped_at"),
             
             # Photos - handle array size
             when(col("photos").isNotNull(), size(col("photos"))).otherwise(lit(0)).alias("photos_count"),
             
+            # Category rating scores
+            *self.category_rating_columns(ta_reviews, 'tripadvisor_reviews'),
+            
             # Metadata
             lit("tripadvisor.com").alias("platform"),
             current_timestamp().alias("processed_at")
         )
         
-        print(f"Transformed {transformed.count()} TripAdvisor review records")
+        transformed = self.apply_quality_rules('tripadvisor_reviews', transformed)
+        
+        print(f"Transformed {self.quality_metrics['tripadvisor_reviews']['passed_records']} TripAdvisor review records")
         return transformed
     
     def transform_geospatial_attractions(self, df):
@@ -356,16 +960,306 @@ class YogyakartaTourismETL:
             # Additional structured info
             col("additionalInfo"),
             col("openingHours").alias("opening_hours"),
+            (col("additionalOpeningHours") if "additionalOpeningHours" in geo_attractions.columns
+             else lit(None)).alias("additionalOpeningHours"),
             col("categories"),
             
+            # Star-count histogram
+            *self.rating_histogram_columns(geo_attractions, 'geospatial_attractions'),
+            
+            # Scrape time, for the attribute snapshots; falls back to the
+            # scrape_date partition, then to the run time
+            coalesce(to_timestamp(col("scrapedAt")), col("scrape_date").cast("timestamp"),
+                     current_timestamp()).alias("scraped_at"),
+            
             # Metadata
             lit("google_maps").alias("platform"),
             current_timestamp().alias("processed_at")
         )
         
-        print(f"Transformed {transformed.count()} geospatial attraction records")
+        # Compact the nested attribute and category structures
+        transformed = self.encode_attraction_attributes(transformed)
+        transformed = self.encode_attraction_categories(transformed)
+        transformed = self.encode_opening_hours(transformed)
+        
+        transformed = self.apply_quality_rules('geospatial_attractions', transformed)
+        
+        print(f"Transformed {self.quality_metrics['geospatial_attractions']['passed_records']} geospatial attraction records")
         return transformed
     
+    def category_rating_columns(self, df, dataset_name):
+        """
+        Typed per-category score columns (0-10 scale) for a dataset, read
+        from its nested ratings array with filter/aggregate in the row
+        projection, so no explode or pivot shuffle is needed
+        """
+        array_column, name_field, score_field, scale = CATEGORY_RATING_SOURCES[dataset_name]
+        platform = dataset_name.split('_')[0]
+        
+        # Scrapes without any category ratings may not have the array at all
+        array_type = df.schema[array_column].dataType if array_column in df.columns else None
+        has_ratings = (isinstance(array_type, ArrayType)
+                       and isinstance(array_type.elementType, StructType)
+                       and name_field in array_type.elementType.fieldNames()
+                       and score_field in array_type.elementType.fieldNames())
+        
+        columns = []
+        for column_name, platform_names in CATEGORY_RATING_COLUMNS.items():
+            names = platform_names[platform]
+            if not has_ratings or not names:
+                columns.append(lit(None).cast("double").alias(column_name))
+                continue
+            
+            matches = filter(col(array_column),
+                             lambda x: lower(trim(x[name_field])).isin(names) & x[score_field].isNotNull())
+            first_score = aggregate(matches, lit(None).cast("double"),
+                                    lambda acc, x: coalesce(acc, x[score_field].cast("double") * scale))
+            columns.append(first_score.alias(column_name))
+        
+        return columns
+    
+    def bubble_score_column(self, df):
+        """
+        Overall TripAdvisor bubble score (0-5) parsed from the label of the
+        first categoryReviewScores entry, falling back to its rounded score
+        """
+        array_column, name_field, score_field = BUBBLE_SCORE_SOURCE
+        array_type = df.schema[array_column].dataType if array_column in df.columns else None
+        if not (isinstance(array_type, ArrayType) and isinstance(array_type.elementType, StructType)):
+            return lit(None).cast("double")
+        
+        fields = array_type.elementType.fieldNames()
+        entry = col(array_column)[0]
+        score = entry[score_field].cast("double") if score_field in fields else lit(None).cast("double")
+        if name_field not in fields:
+            return score
+        
+        # "4,8 dari 5 lingkaran" -> 4.8; the site uses a decimal comma
+        label_value = regexp_extract(entry[name_field], r"^\s*(\d+(?:[.,]\d+)?)", 1)
+        return coalesce(when(label_value != "", regexp_replace(label_value, ",", ".").cast("double")), score)
+    
+    def _struct_field(self, df, struct_column, field):
+        """
+        struct_column.field, also when the dynamic frame resolved the column
+        into a choice struct (e.g. address as string or struct); None when
+        the schema has no such field
+        """
+        struct_type = df.schema[struct_column].dataType if struct_column in df.columns else None
+        if not isinstance(struct_type, StructType):
+            return None
+        if field in struct_type.fieldNames():
+            return col(struct_column)[field]
+        if "struct" in struct_type.fieldNames():
+            choice_type = struct_type["struct"].dataType
+            if isinstance(choice_type, StructType) and field in choice_type.fieldNames():
+                return col(struct_column)["struct"][field]
+        return None
+    
+    def region_column(self, df, dataset_name):
+        """
+        Hotel region from the first populated of a dataset's region sources,
+        then, for TripAdvisor, from its region-level ancestor location
+        """
+        candidates = []
+        for struct_column, field in HOTEL_REGION_SOURCES[dataset_name]:
+            if struct_column is None:
+                candidate = col(field) if field in df.columns else None
+            else:
+                candidate = self._struct_field(df, struct_column, field)
+            if candidate is not None:
+                candidates.append(candidate.cast("string"))
+        
+        array_column, name_field, subcategory_field, subcategories = HOTEL_REGION_ANCESTOR_SOURCE
+        array_type = df.schema[array_column].dataType if array_column in df.columns else None
+        if (dataset_name == 'tripadvisor_hotels' and isinstance(array_type, ArrayType)
+                and isinstance(array_type.elementType, StructType)
+                and {name_field, subcategory_field} <= set(array_type.elementType.fieldNames())):
+            regions = filter(col(array_column), lambda x: lower(trim(x[subcategory_field])).isin(subcategories))
+            candidates.append(regions[0][name_field])
+        
+        if not candidates:
+            return lit(None).cast("string")
+        # Empty strings count as missing
+        return coalesce(*[when(trim(candidate) != "", candidate) for candidate in candidates])
+    
+    def rating_histogram_columns(self, df, dataset_name):
+        """
+        rating_count_1 .. rating_count_5 from a dataset's star-count struct
+        """
+        struct_column, star_fields = RATING_HISTOGRAM_SOURCES[dataset_name]
+        struct_type = df.schema[struct_column].dataType if struct_column in df.columns else None
+        available = set(struct_type.fieldNames()) if isinstance(struct_type, StructType) else set()
+        
+        columns = []
+        for stars, field in enumerate(star_fields, start=1):
+            if field in available:
+                columns.append(col(f"{struct_column}.{field}").cast("integer").alias(f"rating_count_{stars}"))
+            else:
+                columns.append(lit(None).cast("integer").alias(f"rating_count_{stars}"))
+        return columns
+    
+    def attribute_flag(self, group, attribute, mask_column="attribute_mask"):
+        """
+        Column testing one additionalInfo attribute bit, for filters and
+        aggregates over the packed attribute mask
+        """
+        attribute_id = ATTRACTION_ATTRIBUTE_DICTIONARY.index((group, attribute))
+        word, bit = divmod(attribute_id, ATTRIBUTE_BITS_PER_WORD)
+        return col(mask_column)[word].bitwiseAND(lit(1 << bit).cast("long")) != 0
+    
+    def encode_attraction_attributes(self, df):
+        """
+        Replace the nested additionalInfo struct with packed bitsets over the
+        attribute dictionary: attribute_mask holds attributes reported true,
+        attribute_false_mask those explicitly reported false
+        """
+        # Only attributes present in this run's schema can be referenced
+        available = {}
+        info_type = df.schema["additionalInfo"].dataType if "additionalInfo" in df.columns else None
+        if isinstance(info_type, StructType):
+            for field in info_type.fields:
+                if isinstance(field.dataType, ArrayType) and isinstance(field.dataType.elementType, StructType):
+                    available[field.name] = set(field.dataType.elementType.fieldNames())
+        
+        word_count = (len(ATTRACTION_ATTRIBUTE_DICTIONARY) + ATTRIBUTE_BITS_PER_WORD - 1) // ATTRIBUTE_BITS_PER_WORD
+        true_words = [lit(0).cast("long") for _ in range(word_count)]
+        false_words = [lit(0).cast("long") for _ in range(word_count)]
+        encoded_attributes = 0
+        
+        for attribute_id, (group, attribute) in enumerate(ATTRACTION_ATTRIBUTE_DICTIONARY):
+            if attribute not in available.get(group, ()):
+                continue
+            word, bit = divmod(attribute_id, ATTRIBUTE_BITS_PER_WORD)
+            bit_value = lit(1 << bit).cast("long")
+            values = col("additionalInfo").getField(group)
+            
+            is_true = coalesce(exists(values, lambda x: x.getField(attribute) == True), lit(False))
+            is_false = coalesce(exists(values, lambda x: x.getField(attribute) == False), lit(False))
+            true_words[word] = true_words[word].bitwiseOR(when(is_true, bit_value).otherwise(lit(0).cast("long")))
+            false_words[word] = false_words[word].bitwiseOR(when(is_false, bit_value).otherwise(lit(0).cast("long")))
+            encoded_attributes += 1
+        
+        print(f"Encoding {encoded_attributes} additionalInfo attributes "
+              f"(dictionary v{ATTRACTION_ATTRIBUTE_DICTIONARY_VERSION}, {word_count} mask words)")
+        
+        # Attributes the dictionary does not know yet are not encoded; report
+        # them so they can be appended in a new dictionary version
+        known = set(ATTRACTION_ATTRIBUTE_DICTIONARY)
+        unmapped = sorted((group, attribute) for group, attributes in available.items()
+                          for attribute in attributes if (group, attribute) not in known)
+        if unmapped:
+            print(f"Warning: {len(unmapped)} additionalInfo attributes are not in the dictionary "
+                  f"and were dropped:")
+            for group, attribute in unmapped:
+                print(f"  - {group}: {attribute}")
+        
+        return (df.withColumn("attribute_mask", array(*true_words))
+                  .withColumn("attribute_false_mask", array(*false_words))
+                  .withColumn("attribute_dictionary_version", lit(ATTRACTION_ATTRIBUTE_DICTIONARY_VERSION))
+                  .drop("additionalInfo"))
+    
+    def opening_hours_flag(self, day, half_hour, bitmap_column="opening_hours_bitmap"):
+        """
+        Column testing whether an attraction is open in one half-hour slot
+        (day 0 = Monday, half_hour 0-47)
+        """
+        index = day * OPENING_SLOTS_PER_DAY + half_hour
+        byte_value = conv(hex(substring(col(bitmap_column), index // 8 + 1, 1)), 16, 10).cast("int")
+        return byte_value.bitwiseAND(lit(1 << (index % 8))) != 0
+    
+    def encode_opening_hours(self, df):
+        """
+        Replace opening_hours and additionalOpeningHours strings with weekly
+        half-hour bitmaps and summary features, parsed once per attraction
+        """
+        summary_type = StructType([
+            StructField("bitmap", BinaryType()),
+            StructField("weekly_open_hours", DoubleType()),
+            StructField("days_open", IntegerType()),
+            StructField("opening_days", IntegerType()),
+            StructField("open_late", BooleanType()),
+            StructField("open_weekends", BooleanType())
+        ])
+        summarize_udf = udf(summarize_opening_hours, summary_type)
+        bitmap_udf = udf(parse_opening_hours, BinaryType())
+        
+        # additionalOpeningHours is a struct of kind -> [{day, hours}], e.g. Kitchen
+        additional_type = df.schema["additionalOpeningHours"].dataType
+        if isinstance(additional_type, StructType) and additional_type.fields:
+            pairs = []
+            for field in additional_type.fields:
+                pairs += [lit(field.name), bitmap_udf(col(f"additionalOpeningHours.`{field.name}`"))]
+            additional = map_filter(create_map(*pairs), lambda kind, bitmap: bitmap.isNotNull())
+        else:
+            additional = lit(None).cast(MapType(StringType(), BinaryType()))
+        
+        summary = summarize_udf(col("opening_hours"))
+        return (df.withColumn("_opening_summary", summary)
+                  .withColumn("opening_hours_bitmap", col("_opening_summary.bitmap"))
+                  .withColumn("weekly_open_hours", col("_opening_summary.weekly_open_hours"))
+                  .withColumn("days_open", col("_opening_summary.days_open"))
+                  .withColumn("opening_days", col("_opening_summary.opening_days"))
+                  .withColumn("open_late", col("_opening_summary.open_late"))
+                  .withColumn("open_weekends", col("_opening_summary.open_weekends"))
+                  .withColumn("additional_opening_bitmaps", additional)
+                  .drop("_opening_summary", "additionalOpeningHours"))
+    
+    def encode_attraction_categories(self, df):
+        """
+        Replace the categories string array with ids from an append-only
+        category dictionary persisted next to the processed outputs
+        """
+        dictionary_path = f"s3://{self.output_bucket}/{self.output_prefix}/attraction_category_dictionary/"
+        try:
+            known = {row['category']: row['category_id']
+                     for row in self.spark.read.parquet(dictionary_path).collect()}
+        except AnalysisException:
+            known = {}
+        
+        observed = [row['category'] for row in
+                    df.select(explode(col("categories")).alias("category")).distinct().collect()]
+        
+        # New categories get the next ids in name order, existing ids never change
+        next_id = len(known)
+        self.category_dictionary_updates = []
+        for category in sorted(c for c in observed if c is not None and c not in known):
+            known[category] = next_id
+            self.category_dictionary_updates.append((next_id, category))
+            next_id += 1
+        
+        print(f"Category dictionary: {len(known)} categories, {len(self.category_dictionary_updates)} new")
+        
+        if not known:
+            return df.withColumn("category_ids", lit(None).cast("array<int>")).drop("categories")
+        
+        category_map = create_map(*[lit(value) for item in known.items() for value in item])
+        return (df.withColumn("category_ids", transform(col("categories"), lambda c: element_at(category_map, c)))
+                  .drop("categories"))
+    
+    def save_attraction_dictionaries(self):
+        """
+        Write the attribute dictionary and any new category ids
+        """
+        base_path = f"s3://{self.output_bucket}/{self.output_prefix}"
+        
+        attribute_rows = [
+            (attribute_id, group, attribute,
+             attribute_id // ATTRIBUTE_BITS_PER_WORD, attribute_id % ATTRIBUTE_BITS_PER_WORD,
+             ATTRACTION_ATTRIBUTE_DICTIONARY_VERSION)
+            for attribute_id, (group, attribute) in enumerate(ATTRACTION_ATTRIBUTE_DICTIONARY)
+        ]
+        self.spark.createDataFrame(
+            attribute_rows,
+            ["attribute_id", "attribute_group", "attribute_name", "mask_word", "mask_bit", "dictionary_version"]
+        ).coalesce(1).write.mode("overwrite").parquet(f"{base_path}/attraction_attribute_dictionary/")
+        
+        if self.category_dictionary_updates:
+            self.spark.createDataFrame(
+                self.category_dictionary_updates, ["category_id", "category"]
+            ).coalesce(1).write.mode("append").parquet(f"{base_path}/attraction_category_dictionary/")
+        
+        print(f"Saved attraction dictionaries ({len(self.category_dictionary_updates)} new categories)")
+    
     def calculate_distances(self, hotels_df, attractions_df):
         """
         Calculate distances between hotels and attractions using Haversine formula
@@ -454,12 +1348,629 @@ class YogyakartaTourismETL:
                          col("attr_latitude"), col("attr_longitude"))
         )
         
-        # Filter for nearby attractions (within 10km)
-        nearby_attractions = distances_df.filter(col("distance_km") <= 10.0)
+        # Filter for nearby attractions (within distance_radius_km)
+        nearby_attractions = distances_df.filter(col("distance_km") <= self.distance_radius_km)
         
         print(f"Calculated {nearby_attractions.count()} hotel-attraction distance pairs")
         return nearby_attractions
     
+    def load_admin_boundaries(self):
+        """
+        Read the boundary GeoJSON from a local path or s3:// URI; None if
+        it is missing
+        """
+        path = self.admin_boundaries_path
+        try:
+            if path.startswith("s3://"):
+                bucket, key = self._split_s3_uri(path)
+                body = boto3.client('s3').get_object(Bucket=bucket, Key=key)['Body'].read()
+                return json.loads(body).get('features', [])
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('features', [])
+        except Exception as e:
+            print(f"Administrative boundaries not available at {path}: {e}")
+            return None
+    
+    def enrich_admin_regions(self, transformed_data):
+        """
+        Add admin_region_code (kecamatan) and admin_parent_code
+        (kabupaten/kota) integer columns to hotels and attractions by
+        point-in-polygon against a broadcast grid index, one index lookup
+        batch per partition
+        """
+        print("Assigning administrative regions...")
+        features = self.load_admin_boundaries()
+        index = None
+        if features:
+            index = build_admin_region_index(features, self.admin_code_property,
+                                             self.admin_parent_code_property, self.admin_index_cell_degrees)
+            print(f"  Indexed {len(index['polygons'])} polygons in {len(index['cells'])} grid cells")
+        
+        if index is None or not index['polygons']:
+            # Keep the output schema stable when no boundaries are available
+            for data_type in self.admin_enriched_datasets:
+                if transformed_data.get(data_type) is not None:
+                    transformed_data[data_type] = transformed_data[data_type] \
+                        .withColumn("admin_region_code", lit(None).cast("long")) \
+                        .withColumn("admin_parent_code", lit(None).cast("long"))
+            return None
+        
+        broadcast_index = self.spark.sparkContext.broadcast(index)
+        
+        @pandas_udf("long")
+        def region_codes(batches: Iterator[Tuple[pd.Series, pd.Series]]) -> Iterator[pd.Series]:
+            region_index = broadcast_index.value
+            for latitudes, longitudes in batches:
+                codes = []
+                for lat, lng in zip(latitudes, longitudes):
+                    polygon = locate_admin_region(region_index, lat, lng)
+                    codes.append(None if polygon is None else polygon['code'])
+                yield pd.Series(codes, dtype="Int64")
+        
+        parent_codes = {}
+        for polygon in index['polygons']:
+            if polygon['parent_code'] is not None:
+                parent_codes[polygon['code']] = polygon['parent_code']
+        parent_lookup = create_map(*[lit(value).cast("long") for pair in parent_codes.items() for value in pair]) \
+            if parent_codes else None
+        
+        for data_type in self.admin_enriched_datasets:
+            df = transformed_data.get(data_type)
+            if df is None:
+                continue
+            df = df.withColumn("admin_region_code", region_codes(col("latitude"), col("longitude")))
+            if parent_lookup is not None:
+                df = df.withColumn("admin_parent_code", element_at(parent_lookup, col("admin_region_code")))
+            else:
+                df = df.withColumn("admin_parent_code", lit(None).cast("long"))
+            transformed_data[data_type] = df
+        
+        # Small code -> name dimension for joins and dashboards
+        regions = {}
+        for feature in features:
+            properties = feature.get('properties') or {}
+            code = admin_code(properties.get(self.admin_code_property))
+            if code is not None:
+                regions[code] = (code, properties.get(self.admin_name_property),
+                                 admin_code(properties.get(self.admin_parent_code_property)),
+                                 properties.get(self.admin_parent_name_property))
+        return self.spark.createDataFrame(
+            list(regions.values()),
+            StructType([
+                StructField("admin_region_code", LongType()),
+                StructField("admin_region_name", StringType()),
+                StructField("admin_parent_code", LongType()),
+                StructField("admin_parent_name", StringType())
+            ])
+        )
+    
+    def split_hot_cold(self, transformed_data):
+        """
+        Replace each dataset in cold_columns by its narrow hot table and add
+        a <dataset>_text table with the id, platform, processed_at and
+        free-text columns
+        """
+        print("Splitting free-text columns into cold tables...")
+        
+        for data_type, (key_column, text_columns) in self.cold_columns.items():
+            df = transformed_data.get(data_type)
+            if df is None:
+                continue
+            
+            present = [name for name in text_columns if name in df.columns]
+            transformed_data[f"{data_type}{self.cold_table_suffix}"] = df.select(
+                col(key_column), col("platform"), col("processed_at"), *present
+            ).filter(col(key_column).isNotNull())
+            transformed_data[data_type] = df.drop(*present)
+            print(f"  {data_type}: {len(present)} text columns moved to {data_type}{self.cold_table_suffix}")
+    
+    def split_reviewer_dimension(self, transformed_data):
+        """
+        Move reviewer attributes off the review datasets, leaving reviewer_id
+        as the only reviewer column on the facts, and return this run's
+        reviews with their reviewer attributes, one row per review
+        """
+        print("Splitting reviewer dimension from review data...")
+        
+        reviewer_frames = []
+        for review_dataset, date_column in self.review_datasets.items():
+            reviews_df = transformed_data.get(review_dataset)
+            if reviews_df is None:
+                continue
+            
+            reviewer_frames.append(reviews_df.filter(col("reviewer_id").isNotNull()).select(
+                col("reviewer_id"), col("platform"), col("review_id"), *self.reviewer_attributes,
+                col("rating"), col(date_column).alias("review_date")
+            ))
+            transformed_data[review_dataset] = reviews_df.drop(*self.reviewer_attributes)
+        
+        if not reviewer_frames:
+            return None
+        
+        reviewers = reviewer_frames[0]
+        for frame in reviewer_frames[1:]:
+            reviewers = reviewers.unionByName(frame)
+        return reviewers
+    
+    def save_reviewer_dimension(self, reviewer_reviews):
+        """
+        Merge the reviews of this run that the dimension has not counted yet
+        into the stored reviewers dimension
+
+        Re-scraped reviews are dropped by review key first, so review_count
+        and the rating sums count each review once.
+        """
+        print("Updating reviewers dimension...")
+        reviewer_path = f"s3://{self.output_bucket}/{self.reviewer_prefix}/"
+        stored_columns = ["reviewer_id", "platform"] + self.reviewer_attributes + [
+            "review_count", "rating_count", "rating_sum", "first_review_date", "last_review_date"]
+        
+        self.recover_staged_overwrite('reviewers', reviewer_path, ["platform"])
+        
+        # Materialised so the aggregate and the recorded keys see the same reviews
+        new_reviews = self._uncounted_reviews(reviewer_reviews, 'reviewers').localCheckpoint(eager=True)
+        
+        # Latest known value of each attribute, and the review features once
+        reviewers = new_reviews.groupBy("reviewer_id", "platform").agg(
+            *[max_by(col(name), col("review_date")).alias(name) for name in self.reviewer_attributes],
+            count(lit(1)).alias("review_count"),
+            count(col("rating")).alias("rating_count"),
+            sum(col("rating")).alias("rating_sum"),
+            min(col("review_date")).alias("first_review_date"),
+            max(col("review_date")).alias("last_review_date")
+        )
+        
+        merged = reviewers.select(*stored_columns)
+        try:
+            existing = self.spark.read.parquet(reviewer_path).select(*stored_columns)
+            merged = existing.unionByName(merged).groupBy("reviewer_id", "platform").agg(
+                *[max_by(col(name), col("last_review_date")).alias(name) for name in self.reviewer_attributes],
+                sum(col("review_count")).alias("review_count"),
+                sum(col("rating_count")).alias("rating_count"),
+                sum(col("rating_sum")).alias("rating_sum"),
+                min(col("first_review_date")).alias("first_review_date"),
+                max(col("last_review_date")).alias("last_review_date")
+            )
+        except AnalysisException:
+            pass  # First run, this run's reviewers are the whole dimension
+        
+        merged = merged.withColumn("avg_rating", col("rating_sum") / col("rating_count")) \
+                       .withColumn("updated_at", current_timestamp())
+        
+        # The dimension can be too large to collect like the rollup cubes, and
+        # a local checkpoint is lost with its executor, so the merge is staged
+        # on S3 before it overwrites its own input
+        self.overwrite_via_staging('reviewers', merged, reviewer_path, ["platform"])
+        self._record_counted_reviews(new_reviews, 'reviewers')
+        print(f"  reviewers: {self.spark.read.parquet(reviewer_path).count()} rows, "
+              f"{new_reviews.count()} new reviews")
+    
+    def _attribute_hash(self, attributes):
+        # to_json keeps field names, so (null, 5) and (5, null) hash differently
+        return sha2(to_json(struct(*[col(name) for name in attributes])), 256)
+    
+    def snapshot_versions(self, data_type, df):
+        """
+        Every scraped version of this run: the rows that passed the quality
+        rules plus older scrapes of the same key that the unique rule only
+        quarantined as duplicates
+        """
+        key_column, attributes = self.snapshot_tracked_attributes[data_type]
+        columns = [key_column] + attributes + ["scraped_at"]
+        
+        versions = df.select(*columns)
+        quarantined = self.quarantine_data.get(data_type)
+        if quarantined is not None:
+            duplicates_only = forall(col("quality_failures"), lambda code: code.startswith("duplicate_"))
+            versions = versions.unionByName(quarantined.filter(duplicates_only).select(*columns))
+        return versions
+    
+    def build_snapshot_versions(self, data_type, df, current):
+        """
+        Fold this run's versions into the open versions of the stored
+        history, returning every version that is still open (valid_to null)
+        or was closed by this run
+
+        Versions are ordered by scrape time; consecutive versions with the
+        same attributes collapse into the first. Scrapes not newer than the
+        stored open version arrive too late to be placed and are ignored.
+        """
+        key_column, attributes = self.snapshot_tracked_attributes[data_type]
+        batch = df.filter(col(key_column).isNotNull() & col("scraped_at").isNotNull()).select(
+            col(key_column), *[col(name) for name in attributes],
+            self._attribute_hash(attributes).alias("row_hash"),
+            col("scraped_at").alias("valid_from"),
+            lit(False).alias("_stored")
+        ).dropDuplicates([key_column, "valid_from", "row_hash"])
+        
+        candidates = batch
+        if current is not None:
+            stored = current.select(
+                col(key_column), *[col(name).cast(batch.schema[name].dataType).alias(name) for name in attributes],
+                col("row_hash"), col("valid_from"), lit(True).alias("_stored")
+            )
+            stored_from = stored.select(col(key_column), col("valid_from").alias("_stored_from"))
+            batch = batch.join(stored_from, key_column, "left").filter(
+                col("_stored_from").isNull() | (col("valid_from") > col("_stored_from"))
+            ).drop("_stored_from")
+            candidates = stored.unionByName(batch)
+        
+        # A row is a new version when its hash differs from the one before it
+        version_order = Window.partitionBy(col(key_column)).orderBy(col("valid_from"), col("row_hash"))
+        versions = candidates.withColumn("_previous_hash", lag(col("row_hash")).over(version_order)).filter(
+            col("_previous_hash").isNull() | (col("_previous_hash") != col("row_hash"))
+        ).drop("_previous_hash")
+        
+        # Each version stays valid until the next one was scraped
+        return versions.withColumn("valid_to", lead(col("valid_from")).over(version_order))
+    
+    def compact_snapshot_history(self, data_type, closed_path):
+        """
+        Rewrite the closed versions of a history into a few files, dropping
+        versions a failed run appended twice
+        """
+        key_column, _ = self.snapshot_tracked_attributes[data_type]
+        compacted = self.spark.read.parquet(closed_path).dropDuplicates([key_column, "valid_from"]) \
+                                                     .repartition(self.snapshot_compacted_files, col(key_column))
+        
+        # Staged before overwriting the files the history was read from
+        self.overwrite_via_staging(f"snapshots/{data_type}/closed", compacted, closed_path)
+        print(f"  Compacted {data_type} closed versions into {self.snapshot_compacted_files} files")
+    
+    def _write_snapshot_versions(self, data_type, current_path, closed_path):
+        """
+        Append the closed versions staged for a history to closed/ and
+        rewrite current/ with its open versions, then drop the staged copy
+        """
+        staging_path = self._staging_path(f"snapshots/{data_type}/versions")
+        versions = self.spark.read.parquet(staging_path)
+        
+        # Closed versions go first: a failure before current/ is rewritten
+        # only duplicates them, which compaction removes
+        closed = versions.filter(col("valid_to").isNotNull()).drop("_stored")
+        closed_count = closed.count()
+        if closed_count > 0:
+            closed.coalesce(1).write.mode("append").parquet(closed_path)
+        versions.filter(col("valid_to").isNull()).drop("_stored") \
+            .write.mode("overwrite").parquet(current_path)
+        
+        new_count = versions.filter(~col("_stored")).count()
+        self._delete_path(staging_path)
+        return new_count, closed_count
+    
+    def save_attribute_snapshots(self, transformed_data):
+        """
+        Record changed hotel/attraction attributes as SCD type-2 versions:
+        versions superseded by this run are appended to closed/ with their
+        valid_to, and current/ is rewritten with the open version per key
+
+        The versions are staged on S3 before current/, which they are built
+        from, is overwritten; a run that finds staged versions an earlier run
+        did not write out writes them first.
+        """
+        print("Updating attribute snapshots...")
+        
+        for data_type in self.snapshot_tracked_attributes:
+            df = transformed_data.get(data_type)
+            if df is None or self.stage_done(f"snapshots/{data_type}"):
+                continue
+            
+            snapshot_path = f"s3://{self.output_bucket}/{self.snapshot_prefix}/{data_type}"
+            current_path, closed_path = f"{snapshot_path}/current/", f"{snapshot_path}/closed/"
+            self.recover_staged_overwrite(f"snapshots/{data_type}/closed", closed_path)
+            versions_path = self._staging_path(f"snapshots/{data_type}/versions")
+            if self._path_exists(f"{versions_path}/_SUCCESS"):
+                print(f"  {data_type}: writing the versions an interrupted run staged")
+                self._write_snapshot_versions(data_type, current_path, closed_path)
+            
+            try:
+                current = self.spark.read.parquet(current_path)
+            except AnalysisException:
+                current = None  # First run, every key starts a history
+            
+            self.build_snapshot_versions(data_type, self.snapshot_versions(data_type, df), current) \
+                .write.mode("overwrite").parquet(versions_path)
+            new_count, closed_count = self._write_snapshot_versions(data_type, current_path, closed_path)
+            print(f"  {data_type}: {new_count} new versions, {closed_count} versions closed")
+            
+            try:
+                closed_files = len(self.spark.read.parquet(closed_path).inputFiles())
+            except AnalysisException:
+                closed_files = 0
+            if closed_files > self.snapshot_compaction_file_threshold:
+                self.compact_snapshot_history(data_type, closed_path)
+            self.mark_stage(f"snapshots/{data_type}")
+    
+    def _normalized_key(self, column):
+        return lower(trim(column))
+    
+    def _rollup_measures(self, rating_column):
+        """
+        Mergeable aggregates of a rating column: counts, sums, extremes and
+        a fixed-bin histogram
+        """
+        rating = col(rating_column).cast("double")
+        bin_index = least(
+            greatest(floor(rating / self.rating_histogram_bin_width).cast("int"), lit(0)),
+            lit(self.rating_histogram_bins - 1)
+        )
+        return [
+            count(lit(1)).alias("record_count"),
+            count(rating).alias("rating_count"),
+            sum(rating).alias("rating_sum"),
+            sum(rating * rating).alias("rating_sum_squares"),
+            min(rating).alias("rating_min"),
+            max(rating).alias("rating_max"),
+            array(*[sum(when(bin_index == i, 1).otherwise(0)).cast("long")
+                    for i in range(self.rating_histogram_bins)]).alias("rating_histogram")
+        ]
+    
+    def _merge_measures(self, extra_sums=()):
+        """
+        Aggregates that combine already aggregated cube rows
+        """
+        return [
+            sum(col("record_count")).alias("record_count"),
+            sum(col("rating_count")).alias("rating_count"),
+            sum(col("rating_sum")).alias("rating_sum"),
+            sum(col("rating_sum_squares")).alias("rating_sum_squares"),
+            min(col("rating_min")).alias("rating_min"),
+            max(col("rating_max")).alias("rating_max"),
+            array(*[sum(col("rating_histogram")[i]).cast("long")
+                    for i in range(self.rating_histogram_bins)]).alias("rating_histogram")
+        ] + [sum(col(name)).alias(name) for name in extra_sums]
+    
+    def _histogram_quantile(self, quantile):
+        """
+        Approximate quantile (bin midpoint) from the merged rating histogram
+        """
+        cumulative_reached = (
+            f"transform(sequence(1, {self.rating_histogram_bins}), i -> "
+            f"aggregate(slice(rating_histogram, 1, i), 0L, (acc, x) -> acc + x) >= {quantile} * rating_count)"
+        )
+        return when(
+            col("rating_count") > 0,
+            (expr(f"array_position({cumulative_reached}, true)") - 0.5) * self.rating_histogram_bin_width
+        )
+    
+    def _hotel_region(self, hotels):
+        # TripAdvisor hotels saved before the region column was added have none
+        return col("region") if "region" in hotels.columns else lit(None).cast("string")
+    
+    def _admin_codes(self, df):
+        # Outputs saved before admin regions were assigned have no codes
+        return [col(name) if name in df.columns else lit(None).cast("long").alias(name)
+                for name in self.admin_code_columns]
+    
+    def _load_hotel_dimension(self, hotel_dataset, hotels_df, id_column):
+        """
+        Hotel id -> region, admin region codes and accommodation type, from
+        this run's hotels plus hotels saved by earlier runs, so reviews of
+        older hotels still resolve
+        """
+        frames = []
+        if hotels_df is not None:
+            frames.append(hotels_df.select(col(id_column).cast("string").alias("hotel_key"),
+                                           self._hotel_region(hotels_df).alias("region"),
+                                           *self._admin_codes(hotels_df),
+                                           col("accommodation_type"), col("processed_at")))
+        try:
+            saved = self.spark.read.parquet(f"s3://{self.output_bucket}/{self.output_prefix}/{hotel_dataset}/")
+            frames.append(saved.select(col(id_column).cast("string").alias("hotel_key"),
+                                       self._hotel_region(saved).alias("region"),
+                                       *self._admin_codes(saved),
+                                       col("accommodation_type"), col("processed_at")))
+        except AnalysisException:
+            pass
+        
+        if not frames:
+            return None
+        dimension = frames[0]
+        for frame in frames[1:]:
+            dimension = dimension.unionByName(frame)
+        return self._latest_by_key(dimension, ["hotel_key"]).drop("processed_at")
+    
+    def _latest_by_key(self, df, key_columns):
+        """
+        Latest processed_at row per key; processed/ is appended to on every
+        run, so the same id appears once per run that scraped it
+        """
+        latest = row_number().over(Window.partitionBy(*[col(name) for name in key_columns])
+                                   .orderBy(col("processed_at").desc_nulls_last()))
+        return df.withColumn("_latest_rank", latest).filter(col("_latest_rank") == 1).drop("_latest_rank")
+    
+    def _counted_keys_path(self, consumer):
+        return f"s3://{self.output_bucket}/{self.counted_keys_prefix}/{consumer}/"
+    
+    def _uncounted_reviews(self, reviews_df, consumer):
+        """
+        Reviews whose (platform, review_id) no earlier run added to consumer,
+        one row per key
+        """
+        keys = self.review_key_columns
+        reviews = reviews_df.filter(col("review_id").isNotNull()).dropDuplicates(keys)
+        try:
+            counted = self.spark.read.parquet(self._counted_keys_path(consumer)).select(*keys)
+            reviews = reviews.join(counted, keys, "left_anti")
+        except AnalysisException:
+            pass  # Nothing counted yet
+        return reviews
+    
+    def _record_counted_reviews(self, reviews, consumer):
+        """
+        Add the keys of reviews that consumer has now counted to its key set
+        """
+        reviews.select(*self.review_key_columns).write.mode("append") \
+            .partitionBy("platform").parquet(self._counted_keys_path(consumer))
+    
+    def build_rollup_deltas(self, transformed_data):
+        """
+        Aggregate the reviews of this run that no earlier run counted into
+        each review cube: platform x region x accommodation type x month, and
+        platform x admin region codes x accommodation type x month
+
+        Every cube has its own counted key set, so a cube added later still
+        counts the reviews the other cubes already hold. Returns {cube:
+        (delta, keys, extra_sums, new_reviews)}, where new_reviews holds the
+        review keys the delta counts.
+        """
+        dimensions = {}
+        for hotel_dataset, (review_dataset, id_column) in self.hotel_dimensions.items():
+            if transformed_data.get(review_dataset) is not None:
+                dimensions[review_dataset] = self._load_hotel_dimension(
+                    hotel_dataset, transformed_data.get(hotel_dataset), id_column)
+        
+        deltas = {}
+        for cube_name, cube_keys in self.review_cubes.items():
+            review_frames = []
+            for hotel_dataset, (review_dataset, id_column) in self.hotel_dimensions.items():
+                reviews_df = transformed_data.get(review_dataset)
+                if reviews_df is None:
+                    continue
+                
+                dimension = dimensions[review_dataset]
+                review_date = "review_date" if "review_date" in reviews_df.columns else "published_date"
+                reviews = self._uncounted_reviews(reviews_df, cube_name).select(
+                    col("platform"), col("review_id"), col(id_column).cast("string").alias("hotel_key"),
+                    col(review_date), col("rating")
+                )
+                if dimension is not None:
+                    reviews = reviews.join(broadcast(dimension), "hotel_key", "left")
+                else:
+                    reviews = reviews.withColumn("region", lit(None).cast("string")) \
+                                     .withColumn("accommodation_type", lit(None).cast("string"))
+                    for name in self.admin_code_columns:
+                        reviews = reviews.withColumn(name, lit(None).cast("long"))
+                review_frames.append(reviews.select(
+                    col("platform"), col("review_id"),
+                    self._normalized_key(col("region")).alias("region"),
+                    *[col(name) for name in self.admin_code_columns],
+                    self._normalized_key(col("accommodation_type")).alias("accommodation_type"),
+                    trunc(col(review_date), "month").alias("month"),
+                    col("rating")
+                ))
+            
+            if not review_frames:
+                continue
+            
+            combined = review_frames[0]
+            for frame in review_frames[1:]:
+                combined = combined.unionByName(frame)
+            
+            # The delta and the recorded keys must describe the same reviews, and
+            # recording appends to the key set the anti-join read
+            combined = combined.select(*self.review_key_columns, *cube_keys, col("rating")).localCheckpoint(eager=True)
+            delta = combined.groupBy(*cube_keys).agg(*self._rollup_measures("rating"))
+            deltas[cube_name] = (delta, cube_keys, [], combined)
+        
+        return deltas
+    
+    def build_state_rollups(self):
+        """
+        Rebuild the cubes that describe current state from the latest saved
+        row per id: platform x region x admin region codes x accommodation
+        type for hotels, category x neighbourhood x admin region codes for
+        attractions
+
+        Ratings and review counts are snapshots, so adding them up across
+        runs would count every re-scraped hotel or attraction again.
+        """
+        cubes = {}
+        base_path = f"s3://{self.output_bucket}/{self.output_prefix}"
+        
+        hotel_frames = []
+        for hotel_dataset, (_, id_column) in self.hotel_dimensions.items():
+            try:
+                hotels = self.spark.read.parquet(f"{base_path}/{hotel_dataset}/")
+            except AnalysisException:
+                continue
+            hotel_frames.append(self._latest_by_key(hotels.filter(col(id_column).isNotNull()), [id_column]).select(
+                col("platform"),
+                self._normalized_key(self._hotel_region(hotels)).alias("region"),
+                *self._admin_codes(hotels),
+                self._normalized_key(col("accommodation_type")).alias("accommodation_type"),
+                col("rating")
+            ))
+        
+        if hotel_frames:
+            combined = hotel_frames[0]
+            for frame in hotel_frames[1:]:
+                combined = combined.unionByName(frame)
+            hotel_keys = ["platform", "region", *self.admin_code_columns, "accommodation_type"]
+            cubes['hotel_rollup'] = combined.groupBy(*hotel_keys).agg(*self._rollup_measures("rating"))
+        
+        try:
+            attractions = self.spark.read.parquet(f"{base_path}/geospatial_attractions/")
+        except AnalysisException:
+            attractions = None
+        if attractions is not None:
+            attraction_keys = ["category_name", "neighborhood", *self.admin_code_columns]
+            cube = self._latest_by_key(attractions.filter(col("place_id").isNotNull()), ["place_id"]).select(
+                self._normalized_key(col("category_name")).alias("category_name"),
+                self._normalized_key(col("neighborhood")).alias("neighborhood"),
+                *self._admin_codes(attractions),
+                col("rating"), col("reviews_count")
+            ).groupBy(*attraction_keys).agg(
+                *(self._rollup_measures("rating") + [sum(col("reviews_count")).cast("long").alias("reviews_count_sum")])
+            )
+            cubes['attraction_rollup'] = cube
+        
+        return cubes
+    
+    def _write_cube(self, cube_name, cube):
+        """
+        Add the derived quantiles and average and overwrite a stored cube
+        """
+        cube_path = f"s3://{self.output_bucket}/{self.rollup_prefix}/{cube_name}/"
+        for name, quantile in self.rollup_quantiles.items():
+            cube = cube.withColumn(name, self._histogram_quantile(quantile))
+        cube = cube.withColumn("rating_avg", col("rating_sum") / col("rating_count")) \
+                   .withColumn("updated_at", current_timestamp())
+        
+        # Cubes are small; materialising on the driver detaches the result
+        # from the files it was read from, so the path can be overwritten
+        rows = cube.collect()
+        self.spark.createDataFrame(rows, cube.schema).coalesce(1) \
+            .write.mode("overwrite").parquet(cube_path)
+        print(f"  {cube_name}: {len(rows)} rows")
+    
+    def save_rollups(self, transformed_data):
+        """
+        Update the dashboard rollup cubes
+
+        The review cube is merged incrementally and counts each review key
+        once, however often it is re-scraped. Hotel and attraction cubes are
+        rebuilt from the saved outputs, so this runs after they are written.
+        """
+        print("Updating rollup cubes...")
+        
+        for cube_name, (delta, keys, extra_sums, new_reviews) in self.build_rollup_deltas(transformed_data).items():
+            # Merging is not idempotent, so a resumed run skips merged cubes
+            if self.stage_done(f"rollups/{cube_name}"):
+                print(f"  {cube_name}: already merged by this checkpoint")
+                continue
+            cube_path = f"s3://{self.output_bucket}/{self.rollup_prefix}/{cube_name}/"
+            stored_columns = keys + ["record_count", "rating_count", "rating_sum", "rating_sum_squares",
+                                     "rating_min", "rating_max", "rating_histogram"] + extra_sums
+            
+            merged = delta.select(*stored_columns)
+            try:
+                existing = self.spark.read.parquet(cube_path).select(*stored_columns)
+                merged = existing.unionByName(merged).groupBy(*keys).agg(*self._merge_measures(extra_sums))
+            except AnalysisException:
+                pass  # First run, the delta is the whole cube
+            
+            self._write_cube(cube_name, merged)
+            self._record_counted_reviews(new_reviews, cube_name)
+            self.mark_stage(f"rollups/{cube_name}")
+        
+        for cube_name, cube in self.build_state_rollups().items():
+            if self.stage_done(f"rollups/{cube_name}"):
+                print(f"  {cube_name}: already rebuilt by this checkpoint")
+                continue
+            self._write_cube(cube_name, cube)
+            self.mark_stage(f"rollups/{cube_name}")
+    
     def create_summary_statistics(self, transformed_data):
         """
         Create summary statistics for the transformed data
@@ -493,6 +2004,11 @@ class YogyakartaTourismETL:
                     except Exception as e:
                         print(f"Warning: Could not calculate rating stats for {data_type}: {e}")
         
+        for data_type, metrics in self.quality_metrics.items():
+            if data_type in stats:
+                stats[data_type]['quarantined_records'] = metrics['quarantined_records']
+                stats[data_type]['rule_pass_rates'] = metrics['rule_pass_rates']
+        
         print("Summary Statistics:")
         for data_type, stat in stats.items():
             print(f"  {data_type}:")
@@ -501,15 +2017,20 @@ class YogyakartaTourismETL:
         
         return stats
     
-    def save_transformed_data(self, transformed_data):
+    def save_transformed_data(self, transformed_data, output_prefix=None):
         """
         Save transformed data to S3 in parquet format
         """
         print("Saving transformed data to S3...")
+        output_prefix = output_prefix or self.output_prefix
+        failed = []
         
         for data_type, df in transformed_data.items():
-            if df is not None:
-                output_path = f"s3://{self.output_bucket}/{self.output_prefix}/{data_type}/"
+            # Writes append, so a resumed run must not save a dataset twice
+            if df is not None and self.stage_done(f"save/{output_prefix}/{data_type}"):
+                print(f"{data_type} already saved by this checkpoint, skipping")
+            elif df is not None:
+                output_path = f"s3://{self.output_bucket}/{output_prefix}/{data_type}/"
                 
                 print(f"Saving {data_type} to {output_path}")
                 
@@ -530,6 +2051,7 @@ class YogyakartaTourismETL:
                     )
                     
                     print(f"Successfully saved {data_type}")
+                    self.mark_stage(f"save/{output_prefix}/{data_type}")
                 except Exception as e:
                     print(f"Error saving {data_type}: {e}")
                     # Try saving without partitioning as fallback
@@ -542,10 +2064,196 @@ class YogyakartaTourismETL:
                             transformation_ctx=f"write_{data_type}_fallback"
                         )
                         print(f"Successfully saved {data_type} (without partitioning)")
+                        self.mark_stage(f"save/{output_prefix}/{data_type}")
                     except Exception as e2:
                         print(f"Failed to save {data_type}: {e2}")
+                        failed.append(data_type)
         
         print("Data saving process completed!")
+        return failed
+    
+    def _split_s3_uri(self, uri):
+        bucket, _, key = uri[len("s3://"):].partition("/")
+        return bucket, key
+    
+    def input_fingerprint(self, source_locations):
+        """
+        Hash of every source object (key and ETag) plus the settings that
+        change stage outputs
+        """
+        s3_client = boto3.client('s3')
+        paginator = s3_client.get_paginator('list_objects_v2')
+        objects = []
+        for location in source_locations:
+            bucket, prefix = self._split_s3_uri(location)
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+                for obj in page.get('Contents', []):
+                    objects.append([bucket, obj['Key'], obj['ETag']])
+        
+        payload = json.dumps({
+            'objects': sorted(objects),
+            'sample_fraction': self.sample_fraction,
+            'sample_seed': self.sample_seed,
+            'output_prefix': self.output_prefix,
+            'format_version': CHECKPOINT_FORMAT_VERSION
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+    
+    def _read_manifest(self, manifest_path):
+        try:
+            if manifest_path.startswith("s3://"):
+                bucket, key = self._split_s3_uri(manifest_path)
+                body = boto3.client('s3').get_object(Bucket=bucket, Key=key)['Body'].read()
+                return json.loads(body)
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"No usable checkpoint manifest at {manifest_path}: {e}")
+            return None
+    
+    def _write_manifest(self):
+        body = json.dumps(self.checkpoint['manifest'], indent=2, default=str)
+        manifest_path = self.checkpoint['manifest_path']
+        if manifest_path.startswith("s3://"):
+            bucket, key = self._split_s3_uri(manifest_path)
+            boto3.client('s3').put_object(Bucket=bucket, Key=key, Body=body.encode('utf-8'))
+        else:
+            os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+            temp_path = f"{manifest_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(body)
+            os.replace(temp_path, manifest_path)
+    
+    def open_checkpoint(self, fingerprint):
+        """
+        Load the checkpoint of an unfinished run over the same inputs, or
+        start a new one
+        """
+        checkpoint_dir = f"{self.checkpoint_root}/{fingerprint}"
+        manifest_path = f"{checkpoint_dir}/manifest.json"
+        manifest = self._read_manifest(manifest_path)
+        
+        if manifest and manifest.get('status') == 'running':
+            print(f"Resuming checkpoint {fingerprint} from runs {manifest['run_ids']}, "
+                  f"{len(manifest['stages'])} stages complete")
+            manifest['run_ids'].append(self.run_id)
+        else:
+            manifest = {'fingerprint': fingerprint, 'status': 'running', 'run_ids': [self.run_id], 'stages': {}}
+        
+        self.checkpoint = {'dir': checkpoint_dir, 'manifest_path': manifest_path, 'manifest': manifest}
+        self._write_manifest()
+    
+    def stage_done(self, stage):
+        return self.checkpoint is not None and stage in self.checkpoint['manifest']['stages']
+    
+    def mark_stage(self, stage, **details):
+        """
+        Record a completed stage, with any details needed to resume after it
+        """
+        if self.checkpoint is None:
+            return
+        details.update({'run_id': self.run_id, 'completed_at': time.strftime('%Y-%m-%d %H:%M:%S')})
+        self.checkpoint['manifest']['stages'][stage] = details
+        self._write_manifest()
+    
+    def checkpoint_frames(self, stage, frames, **details):
+        """
+        Write a stage's DataFrames to the staging area, mark the stage
+        complete and return the frames read back from the checkpoint
+        """
+        if self.checkpoint is None:
+            return frames
+        
+        saved = []
+        for name, df in frames.items():
+            if df is not None:
+                df.write.mode("overwrite").parquet(f"{self.checkpoint['dir']}/{stage}/{name}/")
+                saved.append(name)
+        self.mark_stage(stage, frames=saved, **details)
+        return self.load_frames(stage, list(frames))
+    
+    def load_frames(self, stage, names):
+        """
+        Frames of a completed stage; names it did not produce come back None
+        """
+        saved = self.checkpoint['manifest']['stages'][stage].get('frames', [])
+        return {name: self.spark.read.parquet(f"{self.checkpoint['dir']}/{stage}/{name}/") if name in saved else None
+                for name in names}
+    
+    def finish_checkpoint(self):
+        """
+        Mark the run complete and drop its staged frames
+        """
+        if self.checkpoint is None:
+            return
+        self.checkpoint['manifest']['status'] = 'completed'
+        self._write_manifest()
+        
+        checkpoint_dir = self.checkpoint['dir']
+        if checkpoint_dir.startswith("s3://"):
+            bucket, prefix = self._split_s3_uri(checkpoint_dir)
+            s3_client = boto3.client('s3')
+            paginator = s3_client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=bucket, Prefix=f"{prefix}/"):
+                keys = [{'Key': obj['Key']} for obj in page.get('Contents', [])
+                        if not obj['Key'].endswith('manifest.json')]
+                if keys:
+                    s3_client.delete_objects(Bucket=bucket, Delete={'Objects': keys})
+        else:
+            for name in os.listdir(checkpoint_dir):
+                path = os.path.join(checkpoint_dir, name)
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+    
+    def _path_exists(self, uri):
+        if uri.startswith("s3://"):
+            bucket, key = self._split_s3_uri(uri)
+            return boto3.client('s3').list_objects_v2(Bucket=bucket, Prefix=key, MaxKeys=1).get('KeyCount', 0) > 0
+        return os.path.exists(uri)
+    
+    def _delete_path(self, uri):
+        if uri.startswith("s3://"):
+            bucket, prefix = self._split_s3_uri(uri)
+            s3_client = boto3.client('s3')
+            paginator = s3_client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=bucket, Prefix=f"{prefix.rstrip('/')}/"):
+                keys = [{'Key': obj['Key']} for obj in page.get('Contents', [])]
+                if keys:
+                    s3_client.delete_objects(Bucket=bucket, Delete={'Objects': keys})
+        else:
+            shutil.rmtree(uri, ignore_errors=True)
+    
+    def _staging_path(self, name):
+        # Fixed per target rather than per run, so a later run finds the copy
+        return f"{self.checkpoint_root}/_rewrites/{name}"
+    
+    def _finish_staged_overwrite(self, name, target_path, partition_by):
+        staging_path = self._staging_path(name)
+        writer = self.spark.read.parquet(staging_path).write.mode("overwrite")
+        if partition_by:
+            writer = writer.partitionBy(*partition_by)
+        writer.parquet(target_path)
+        self._delete_path(staging_path)
+    
+    def overwrite_via_staging(self, name, df, target_path, partition_by=()):
+        """
+        Overwrite target_path with df, which may have been read from it
+
+        df is written to a staging copy and the target is rewritten from that
+        copy, so no task ever recomputes df from files the overwrite already
+        deleted. The copy is only removed once the target is rewritten.
+        """
+        df.write.mode("overwrite").parquet(self._staging_path(name))
+        self._finish_staged_overwrite(name, target_path, partition_by)
+    
+    def recover_staged_overwrite(self, name, target_path, partition_by=()):
+        """
+        Finish an overwrite_via_staging that an earlier run staged completely
+        but did not finish, before target_path is read again
+        """
+        if self._path_exists(f"{self._staging_path(name)}/_SUCCESS"):
+            print(f"  Restoring {target_path} from the copy an interrupted run staged")
+            self._finish_staged_overwrite(name, target_path, partition_by)
     
     def run_etl_pipeline(self):
         """
@@ -555,24 +2263,85 @@ class YogyakartaTourismETL:
         print("=" * 60)
         
         try:
-            # Step 1: Read source data
-            source_df, source_dynamic_frame = self.read_source_data()
+            # Checkpoints are keyed by the inputs, so a rerun after a failure
+            # resumes from the first incomplete stage
+            source_locations = self.get_source_locations()
+            self.open_checkpoint(self.input_fingerprint(source_locations))
+            
+            transforms = [
+                ('booking_hotels', self.transform_booking_hotels),
+                ('booking_reviews', self.transform_booking_reviews),
+                ('tripadvisor_hotels', self.transform_tripadvisor_hotels),
+                ('tripadvisor_reviews', self.transform_tripadvisor_reviews),
+                ('geospatial_attractions', self.transform_geospatial_attractions)
+            ]
             
-            # Step 2: Identify data sources
-            identified_df = self.identify_data_sources(source_df)
+            identified_df = None
+            source_read = False
+            if any(not self.stage_done(f"transformed/{name}") for name, _ in transforms):
+                if self.stage_done('identified'):
+                    print("Resuming from checkpointed identified records")
+                    identified_df = self.load_frames('identified', ['identified'])['identified']
+                else:
+                    # Step 1: Read source data
+                    source_df, source_dynamic_frame = self.read_source_data()
+                    source_read = True
+                    
+                    # Step 2: Identify data sources
+                    identified_df = self.identify_data_sources(source_df)
+                    if self.sample_fraction:
+                        identified_df = self.sample_identified_data(identified_df)
+                    identified_df = self.checkpoint_frames('identified', {'identified': identified_df})['identified']
+            
+            if not source_read:
+                # The job bookmark only advances over files read in this run,
+                # so register the source frame even when resuming past it
+                self.source_dynamic_frame(source_locations)
             
             # Step 3: Transform each data source
             transformed_data = {}
             
-            transformed_data['booking_hotels'] = self.transform_booking_hotels(identified_df)
-            transformed_data['booking_reviews'] = self.transform_booking_reviews(identified_df)
-            transformed_data['tripadvisor_hotels'] = self.transform_tripadvisor_hotels(identified_df)
-            transformed_data['tripadvisor_reviews'] = self.transform_tripadvisor_reviews(identified_df)
-            transformed_data['geospatial_attractions'] = self.transform_geospatial_attractions(identified_df)
+            for name, transform in transforms:
+                stage = f"transformed/{name}"
+                if self.stage_done(stage):
+                    print(f"Resuming {name} from checkpoint")
+                    details = self.checkpoint['manifest']['stages'][stage]
+                    if details['quality_metrics'] is not None:
+                        self.quality_metrics[name] = details['quality_metrics']
+                    if name == 'geospatial_attractions':
+                        self.category_dictionary_updates = [tuple(update) for update in details['category_updates']]
+                    frames = self.load_frames(stage, [name, 'quarantine'])
+                else:
+                    frames = self.checkpoint_frames(
+                        stage,
+                        {name: transform(identified_df), 'quarantine': self.quarantine_data.get(name)},
+                        quality_metrics=self.quality_metrics.get(name),
+                        category_updates=self.category_dictionary_updates if name == 'geospatial_attractions' else []
+                    )
+                    # Read back from the checkpoint, so the flagged rows are no longer needed
+                    if self.checkpoint is not None:
+                        self.release_quality_cache(name)
+                transformed_data[name] = frames[name]
+                if frames['quarantine'] is not None:
+                    self.quarantine_data[name] = frames['quarantine']
+            
+            # Canonical administrative region codes for hotels and attractions
+            admin_regions = self.enrich_admin_regions(transformed_data)
+            
+            # Free text goes to cold tables so later stages only shuffle hot columns
+            self.split_hot_cold(transformed_data)
+            
+            # Reviewer attributes go to their own dimension, keyed by reviewer_id
+            reviewers = self.split_reviewer_dimension(transformed_data)
             
             # Step 4: Calculate distances between hotels and attractions
-            hotel_dataframes = [transformed_data['booking_hotels'], transformed_data['tripadvisor_hotels']]
-            distances_df = self.calculate_distances(hotel_dataframes, transformed_data['geospatial_attractions'])
+            if self.stage_done('distances'):
+                print("Resuming distances from checkpoint")
+                distances_df = self.load_frames('distances', ['distances'])['distances']
+            else:
+                hotel_dataframes = [transformed_data['booking_hotels'], transformed_data['tripadvisor_hotels']]
+                distances_df = self.calculate_distances(hotel_dataframes, transformed_data['geospatial_attractions'])
+                distances_df = self.checkpoint_frames('distances', {'distances': distances_df})['distances']
             if distances_df is not None:
                 transformed_data['hotel_attraction_distances'] = distances_df
             
@@ -580,7 +2349,34 @@ class YogyakartaTourismETL:
             stats = self.create_summary_statistics(transformed_data)
             
             # Step 6: Save transformed data
-            self.save_transformed_data(transformed_data)
+            failed_saves = self.save_transformed_data(transformed_data)
+            if transformed_data['geospatial_attractions'] is not None and not self.stage_done('save/dictionaries'):
+                self.save_attraction_dictionaries()
+                self.mark_stage('save/dictionaries')
+            if admin_regions is not None:
+                admin_regions.coalesce(1).write.mode("overwrite") \
+                    .parquet(f"s3://{self.output_bucket}/{self.output_prefix}/admin_regions/")
+            
+            # Step 7: Save rows that failed quality rules, with their reason codes
+            if self.quarantine_data:
+                failed_saves += self.save_transformed_data(self.quarantine_data, output_prefix=self.quarantine_prefix)
+            if failed_saves:
+                # Fail the run so the next one resumes and retries only these
+                raise RuntimeError(f"Could not save {failed_saves}; rerun to resume from the checkpoint")
+            
+            # Step 8: Merge new reviews into, and rebuild state in, the dashboard rollup cubes
+            self.save_rollups(transformed_data)
+            
+            # Step 9: Merge this run's reviewers into the reviewers dimension
+            if reviewers is not None and not self.stage_done('reviewers'):
+                self.save_reviewer_dimension(reviewers)
+                self.mark_stage('reviewers')
+            
+            # Step 10: Record changed hotel/attraction attributes as SCD2 versions
+            self.save_attribute_snapshots(transformed_data)
+            
+            self.release_quality_cache()
+            self.finish_checkpoint()
             
             print("\n" + "=" * 60)
             print("ETL Pipeline completed successfully!")
@@ -594,10 +2390,34 @@ class YogyakartaTourismETL:
             traceback.print_exc()
             raise e
 
-# Main execution
+# Main execution; Glue runs the script as __main__, importing it (e.g. from
+# tests) has no Glue side effects
 if __name__ == "__main__":
+    # Initialize Glue context
+    args = getResolvedOptions(sys.argv, ['JOB_NAME'])
+    # Optional sampling mode: --sample_fraction 0.05 [--sample_seed 7], and
+    # --checkpoint_root to stage checkpoints somewhere other than S3 staging/etl,
+    # --admin_boundaries_path for the DIY boundary GeoJSON (local or s3://).
+    # Glue passes JOB_RUN_ID itself; it tags the checkpoint manifest.
+    for optional_arg in ['sample_fraction', 'sample_seed', 'checkpoint_root', 'admin_boundaries_path', 'JOB_RUN_ID']:
+        if f"--{optional_arg}" in sys.argv:
+            args.update(getResolvedOptions(sys.argv, [optional_arg]))
+    sc = SparkContext()
+    glueContext = GlueContext(sc)
+    spark = glueContext.spark_session
+    job = Job(glueContext)
+    job.init(args['JOB_NAME'], args)
+    
     # Initialize ETL processor
-    etl_processor = YogyakartaTourismETL(glueContext, spark)
+    etl_processor = YogyakartaTourismETL(
+        glueContext, spark,
+        sample_fraction=float(args['sample_fraction']) if 'sample_fraction' in args else None,
+        sample_seed=int(args.get('sample_seed', 42)),
+        run_id=args.get('JOB_RUN_ID'),
+        checkpoint_root=args.get('checkpoint_root')
+    )
+    if 'admin_boundaries_path' in args:
+        etl_processor.admin_boundaries_path = args['admin_boundaries_path']
     
     # Run ETL pipeline
     success = etl_processor.run_etl_pipeline()
@@ -607,6 +2427,8 @@ if __name__ == "__main__":
         print(f"Transformed data available in S3 bucket: {etl_processor.output_bucket}/{etl_processor.output_prefix}/")
     else:
         print("\nETL job failed!")
-
-# Commit the job
-job.commit()
\ No newline at end of file
+    
+    # Commit the job; sampled runs leave the bookmark alone so the next full run
+    # still processes every record
+    if not args.get('sample_fraction'):
+        job.commit()
@@ -0,0 +1,295 @@
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("boto3")
+
+from botocore.exceptions import ClientError  # noqa: E402
+
+import aws_glue_crawler_implementation as crawler_module  # noqa: E402
+
+
+def client_error(code, operation):
+    return ClientError({'Error': {'Code': code, 'Message': code}}, operation)
+
+
+class FakePaginator:
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def paginate(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.pages(**kwargs)
+
+
+class FakeGlueClient:
+    def __init__(self):
+        self.paginators = {}
+        # Crawler name -> list of get_crawler states, the last one repeats
+        self.crawler_states = {}
+        self.start_errors = {}
+        self.started = []
+        self.stopped = []
+
+    def get_paginator(self, operation):
+        return self.paginators[operation]
+
+    def start_crawler(self, Name):
+        self.started.append(Name)
+        if Name in self.start_errors:
+            raise client_error(self.start_errors[Name], 'StartCrawler')
+
+    def stop_crawler(self, Name):
+        self.stopped.append(Name)
+
+    def get_crawler(self, Name):
+        states = self.crawler_states[Name]
+        state, last_crawl = states.pop(0) if len(states) > 1 else states[0]
+        return {'Crawler': {'Name': Name, 'State': state, 'LastCrawl': last_crawl}}
+
+
+class FakeS3Client:
+    def __init__(self, objects):
+        self.objects = objects
+        self.ranges = []
+
+    def get_object(self, Bucket, Key, Range):
+        self.ranges.append((Key, Range))
+        data = self.objects[Key]
+        start, end = (int(value) for value in Range[len("bytes="):].split("-"))
+        if start >= len(data):
+            raise client_error('InvalidRange', 'GetObject')
+        end = min(end, len(data) - 1)
+        return {'Body': io.BytesIO(data[start:end + 1]), 'ContentRange': f"bytes {start}-{end}/{len(data)}"}
+
+    def get_paginator(self, operation):
+        assert operation == 'list_objects_v2'
+
+        def pages(Bucket, Prefix):
+            return [{'Contents': [{'Key': key} for key in sorted(self.objects) if key.startswith(Prefix)]}]
+        return FakePaginator(pages)
+
+
+class FakeClock:
+    """
+    monotonic() replacement advanced by the waits of FakeEvent
+    """
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class FakeEvent:
+    def __init__(self, clock, cancelled=False):
+        self.clock = clock
+        self.cancelled = cancelled
+        self.waits = []
+
+    def is_set(self):
+        return self.cancelled
+
+    def set(self):
+        self.cancelled = True
+
+    def wait(self, timeout):
+        self.waits.append(timeout)
+        self.clock.now += timeout
+        return self.cancelled
+
+
+@pytest.fixture
+def crawler(tmp_path):
+    instance = crawler_module.YogyakartaTourismDataCrawler(region_name='us-east-1')
+    instance.glue_client = FakeGlueClient()
+    instance.s3_client = FakeS3Client({})
+    instance.catalog_cache_path = str(tmp_path / "catalog_cache.json")
+    return instance
+
+
+def partition_pages(dates):
+    def pages(Expression=None, Segment=None, **kwargs):
+        selected = dates
+        if Expression is not None:
+            latest = Expression.split("'")[1]
+            selected = [date for date in dates if date > latest]
+        # Spread partitions over the requested segments
+        number, total = Segment['SegmentNumber'], Segment['TotalSegments']
+        return [{'Partitions': [{'Values': [date]} for date in selected[number::total]]}]
+    return pages
+
+
+def test_refresh_partitions_fetches_only_new_partitions(crawler):
+    paginator = FakePaginator(partition_pages(['2025-01-01', '2025-02-01', '2025-03-01']))
+    crawler.glue_client.paginators['get_partitions'] = paginator
+    table_info = {'name': 'yogya_tourism_booking_hotels', 'partition_keys': ['scrape_date'],
+                  'partitions': [['2025-01-01'], ['2025-02-01']]}
+
+    crawler._refresh_partitions(table_info)
+
+    assert table_info['partitions'] == [['2025-01-01'], ['2025-02-01'], ['2025-03-01']]
+    assert table_info['partition_count'] == 3
+    assert [call['Expression'] for call in paginator.calls] == ["scrape_date > '2025-02-01'"]
+
+
+def test_refresh_partitions_lists_uncached_table_in_full(crawler):
+    paginator = FakePaginator(partition_pages(['2025-03-01', '2025-01-01', '2025-02-01']))
+    crawler.glue_client.paginators['get_partitions'] = paginator
+    table_info = {'name': 'yogya_tourism_booking_hotels', 'partition_keys': ['scrape_date'], 'partitions': []}
+
+    crawler._refresh_partitions(table_info)
+
+    assert table_info['partitions'] == [['2025-01-01'], ['2025-02-01'], ['2025-03-01']]
+    assert len(paginator.calls) == crawler.partition_segments
+    assert all('Expression' not in call for call in paginator.calls)
+
+
+def crawl(status, start_time):
+    return {'Status': status, 'StartTime': start_time}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(crawler_module.time, 'monotonic', fake.monotonic)
+    return fake
+
+
+def test_wait_for_crawler_backs_off_while_running(crawler, clock):
+    started_after = datetime(2025, 3, 1, tzinfo=timezone.utc).timestamp()
+    previous = crawl('SUCCEEDED', datetime(2025, 2, 1, tzinfo=timezone.utc))
+    finished = crawl('SUCCEEDED', datetime(2025, 3, 1, 0, 1, tzinfo=timezone.utc))
+    crawler.glue_client.crawler_states['c'] = [('READY', previous), ('RUNNING', previous), ('RUNNING', previous),
+                                               ('RUNNING', previous), ('STOPPING', previous), ('READY', finished)]
+    event = FakeEvent(clock)
+
+    assert crawler.wait_for_crawler('c', timeout=60, cancel_event=event, started_after=started_after) == finished
+    # Not picked up yet and STOPPING poll at the initial delay, RUNNING backs off
+    assert event.waits == [2, 2, 3, 4.5, 2]
+    assert crawler.glue_client.stopped == []
+
+
+def test_wait_for_crawler_backoff_is_capped(crawler, clock):
+    crawler.poll_max_delay = 5
+    finished = crawl('SUCCEEDED', datetime.now(timezone.utc))
+    crawler.glue_client.crawler_states['c'] = [('RUNNING', {})] * 5 + [('READY', finished)]
+    event = FakeEvent(clock)
+
+    crawler.wait_for_crawler('c', timeout=60, cancel_event=event)
+    assert event.waits == [2, 3, 4.5, 5, 5]
+
+
+def test_wait_for_crawler_timeout_stops_the_crawl(crawler, clock):
+    crawler.glue_client.crawler_states['c'] = [('RUNNING', {})]
+    event = FakeEvent(clock)
+
+    with pytest.raises(TimeoutError):
+        crawler.wait_for_crawler('c', timeout=10, cancel_event=event)
+    # The last wait is cut short at the deadline
+    assert event.waits == [2, 3, 4.5, 0.5]
+    assert crawler.glue_client.stopped == ['c']
+
+
+def test_wait_for_crawler_cancel_stops_the_crawl(crawler, clock):
+    crawler.glue_client.crawler_states['c'] = [('RUNNING', {})]
+    event = FakeEvent(clock, cancelled=True)
+
+    assert crawler.wait_for_crawler('c', timeout=60, cancel_event=event) == {'Status': 'CANCELLED'}
+    assert event.waits == []
+    assert crawler.glue_client.stopped == ['c']
+
+
+def test_stop_ignores_crawler_that_already_finished(crawler):
+    def stop_crawler(Name):
+        raise client_error('CrawlerNotRunningException', 'StopCrawler')
+    crawler.glue_client.stop_crawler = stop_crawler
+
+    crawler._stop_crawler_quietly('c')
+
+
+def test_run_crawlers_concurrently_reports_each_crawler(crawler):
+    finished = crawl('SUCCEEDED', datetime.now(timezone.utc) + timedelta(minutes=1))
+    glue = crawler.glue_client
+    glue.crawler_states = {'hotels': [('READY', finished)], 'reviews': [('READY', finished)],
+                           'missing': [('READY', {})]}
+    # A crawler that is already running is waited for, one that fails to start is reported
+    glue.start_errors = {'reviews': 'CrawlerRunningException', 'missing': 'EntityNotFoundException'}
+
+    results = crawler.run_crawlers_concurrently(['hotels', 'reviews', 'missing'], timeout=60)
+
+    assert sorted(glue.started) == ['hotels', 'missing', 'reviews']
+    assert results['hotels'] == finished and results['reviews'] == finished
+    assert results['missing']['Status'] == 'FAILED'
+    assert 'EntityNotFoundException' in results['missing']['ErrorMessage']
+
+
+@pytest.mark.parametrize('chunks, expected', [
+    ([b'[12', b'345]'], [12345]),
+    ([b'[{"name": "Hotel Tent', b'rem", "stars": 5}', b', {"name": "Ibis"}]'],
+     [{'name': 'Hotel Tentrem', 'stars': 5}, {'name': 'Ibis'}]),
+    # A multi-byte character split across chunks
+    ([b'["Caf\xc3', b'\xa9", true, null]'], ['Caf\u00e9', True, None]),
+    ([b'\xef\xbb\xbf[\n  1,\n  2\n', b']'], [1, 2]),
+    ([b'[]'], []),
+])
+def test_iter_json_array_records_across_chunks(chunks, expected):
+    assert list(crawler_module.iter_json_array_records(chunks)) == expected
+
+
+def test_iter_json_array_records_rejects_truncated_record():
+    with pytest.raises(ValueError):
+        list(crawler_module.iter_json_array_records([b'[{"name": ', b'"Ibis"']))
+
+
+def raw_array(records):
+    return json.dumps(records, indent=2).encode('utf-8')
+
+
+def test_iter_raw_object_chunks_reads_whole_object_in_ranges(crawler):
+    data = raw_array([{'hotelId': index} for index in range(20)])
+    crawler.s3_client = FakeS3Client({'raw-json/booking_hotels/a.json': data, 'raw-json/booking_hotels/empty.json': b''})
+    crawler.validation_chunk_size = 64
+
+    assert b''.join(crawler.iter_raw_object_chunks('raw-json/booking_hotels/a.json')) == data
+    assert len(crawler.s3_client.ranges) == -(-len(data) // 64)
+    assert list(crawler.iter_raw_object_chunks('raw-json/booking_hotels/empty.json')) == []
+
+
+def test_sample_raw_records_stops_reading_early(crawler):
+    records = [{'hotelId': index, 'name': f"Hotel {index}"} for index in range(500)]
+    data = raw_array(records)
+    crawler.s3_client = FakeS3Client({'raw-json/booking_hotels/a.json': data})
+    crawler.validation_chunk_size = 50  # records straddle chunk boundaries
+
+    assert crawler.sample_raw_records('raw-json/booking_hotels/a.json', sample_size=3) == records[:3]
+    last_range = crawler.s3_client.ranges[-1][1]
+    assert int(last_range.split("-")[-1]) < len(data) // 10
+
+
+def test_validate_sampled_content_reports_coverage_and_types(crawler):
+    hotels = [
+        {'name': 'Hotel Tentrem', 'type': 'Hotel', 'stars': 5, 'location': {'lat': '-7.77', 'lng': '110.37'},
+         'address': {'region': 'Yogyakarta'}, 'facilities': [], 'hotelId': 1234567},
+        {'name': 'Ibis Malioboro', 'type': 'Hotel', 'stars': '3', 'location': {'lat': '-7.79', 'lng': '110.36'},
+         'address': {'region': 'Yogyakarta'}, 'facilities': [], 'hotelId': None},
+    ]
+    crawler.s3_client = FakeS3Client({
+        'raw-json/booking_hotels/scrape_date=2025-03-01/booking - full hotel.json': raw_array(hotels),
+        'raw-json/booking_reviews/scrape_date=2025-03-01/booking - full review of hotel.json': b'[{"broken": ',
+    })
+    crawler.validation_chunk_size = 40
+
+    results = crawler.validate_sampled_content(sample_size=10, max_workers=2)
+
+    booking = results['booking_hotels']
+    assert booking['objects_sampled'] == 1 and booking['records_sampled'] == 2
+    assert booking['field_coverage']['hotelId'] == 0.5
+    assert booking['field_coverage']['name'] == 1.0
+    assert booking['type_mismatches'] == {'stars': {'expected': 'number', 'found': {'string': 1}}}
+    # An object that cannot be decoded is reported, not raised
+    assert results['booking_reviews']['records_sampled'] == 0
+    assert results['geospatial_attractions']['objects_sampled'] == 0
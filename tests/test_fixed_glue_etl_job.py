@@ -0,0 +1,145 @@
+import json
+import math
+
+import pytest
+
+pytest.importorskip("pyspark")
+
+from pyspark.sql.functions import col, lit  # noqa: E402
+
+import fixed_glue_etl_job as etl_job  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def etl(spark):
+    return etl_job.YogyakartaTourismETL(None, spark, sample_fraction=0.5)
+
+
+def records_frame(spark, records):
+    return spark.read.json(spark.sparkContext.parallelize([json.dumps(record) for record in records]))
+
+
+def test_booking_hotel_indonesian_category_titles(etl):
+    # Trimmed from a lang=id Booking hotel scrape
+    hotel = {
+        'hotelId': 1234567,
+        'name': 'Hotel Tentrem Yogyakarta',
+        'categoryReviews': [
+            {'title': 'Staf', 'score': 9.1},
+            {'title': 'Fasilitas', 'score': 8.8},
+            {'title': 'Kebersihan', 'score': 9.0},
+            {'title': 'Kenyamanan', 'score': 9.2},
+            {'title': 'Sesuai harga', 'score': 8.6},
+            {'title': 'Lokasi', 'score': 8.9},
+            {'title': 'WiFi gratis', 'score': 8.4}
+        ]
+    }
+    df = records_frame(etl.spark, [hotel])
+    row = df.select(*etl.category_rating_columns(df, 'booking_hotels')).first()
+
+    assert row['staff_score'] == pytest.approx(9.1)
+    assert row['facilities_score'] == pytest.approx(8.8)
+    assert row['cleanliness_score'] == pytest.approx(9.0)
+    assert row['comfort_score'] == pytest.approx(9.2)
+    assert row['value_for_money_score'] == pytest.approx(8.6)
+    assert row['location_score'] == pytest.approx(8.9)
+    assert row['free_wifi_score'] == pytest.approx(8.4)
+    assert row['rooms_score'] is None
+
+
+def test_tripadvisor_hotel_bubble_score(etl):
+    # categoryReviewScores as scraped from the Indonesian TripAdvisor site
+    hotels = [
+        {'locationId': '301505', 'rating': 4.4,
+         'categoryReviewScores': [{'categoryName': '4,3 dari 5 lingkaran', 'score': 4}]},
+        {'locationId': '306172', 'rating': 3.5,
+         'categoryReviewScores': [{'categoryName': 'tanpa nilai', 'score': 3}]},
+        {'locationId': '1528437', 'rating': 5.0, 'categoryReviewScores': []}
+    ]
+    df = records_frame(etl.spark, hotels)
+    rows = df.select(col("locationId"), etl.bubble_score_column(df).alias("overall_bubble_score")).collect()
+    scores = {row['locationId']: row['overall_bubble_score'] for row in rows}
+
+    assert scores['301505'] == pytest.approx(4.3)
+    assert scores['306172'] == pytest.approx(3.0)
+    assert scores['1528437'] is None
+
+
+def test_sample_keeps_attraction_across_cell_boundary(etl):
+    cell = etl.sample_cell_degrees
+    boundary = math.floor(-7.80 / cell) * cell
+    hotel = {'data_source_type': 'booking_hotel', 'row_id': 1, 'hotelId': 5250432,
+             'location': {'lat': boundary - 0.002, 'lng': 110.3650}}
+    attraction = {'data_source_type': 'geospatial_attraction', 'row_id': 2,
+                  'placeId': 'ChIJ7bB5yO5Xei4R0H3cwLJ8Xag',
+                  'location': {'lat': boundary + 0.002, 'lng': 110.3660}}
+    far_hotel = {'data_source_type': 'tripadvisor_hotel', 'row_id': 3, 'locationId': '306172',
+                 'latitude': -7.95, 'longitude': 110.60}
+    df = records_frame(etl.spark, [hotel, attraction, far_hotel])
+
+    # The pair is ~0.5 km apart but falls in two different grid cells
+    assert math.floor(hotel['location']['lat'] / cell) != math.floor(attraction['location']['lat'] / cell)
+
+    # Find a seed that samples the hotel but not the attraction on its own
+    keys = df.select(lit("booking:5250432").alias("hotel"),
+                     lit(f"place:{attraction['placeId']}").alias("place")).limit(1)
+    for seed in range(100):
+        etl.sample_seed = seed
+        decision = keys.select(etl._sampled(col("hotel")).alias("hotel"),
+                               etl._sampled(col("place")).alias("place")).first()
+        if decision['hotel'] and not decision['place']:
+            break
+    else:
+        pytest.fail("no seed samples the hotel without the attraction")
+
+    sampled = {row['row_id'] for row in etl.sample_identified_data(df).collect()}
+    assert {1, 2} <= sampled
+
+
+def test_hotel_region_from_populated_fields(etl):
+    booking = {'hotelId': 5250432, 'state': None,
+               'address': {'full': 'Jalan Brigjend. Katamso-Ireda, 55152 Yogyakarta, Indonesia',
+                           'postalCode': '55152', 'country': 'Indonesia', 'region': 'Yogyakarta'}}
+    booking_df = records_frame(etl.spark, [booking])
+    assert booking_df.select(etl.region_column(booking_df, 'booking_hotels').alias("region")).first()['region'] \
+        == 'Yogyakarta'
+
+    # addressObj city/state are null throughout the TripAdvisor scrape
+    tripadvisor = {'locationId': '306172', 'city': None, 'state': None,
+                   'addressObj': {'street1': 'Jl. HOS. Cokroaminoto no. 145', 'city': None, 'state': None,
+                                  'country': 'Indonesia', 'postalcode': '55244'},
+                   'ancestorLocations': [
+                       {'id': '1', 'name': 'Sleman District', 'subcategory': 'Distrik'},
+                       {'id': '294230', 'name': 'Yogyakarta', 'subcategory': 'Wilayah'},
+                       {'id': '294228', 'name': 'Jawa', 'subcategory': 'Wilayah'},
+                       {'id': '294225', 'name': 'Indonesia', 'subcategory': 'Negara'}]}
+    ta_df = records_frame(etl.spark, [tripadvisor])
+    assert ta_df.select(etl.region_column(ta_df, 'tripadvisor_hotels').alias("region")).first()['region'] \
+        == 'Yogyakarta'
+
+
+def test_overwrite_via_staging_rewrites_its_own_input(spark, tmp_path):
+    etl = etl_job.YogyakartaTourismETL(None, spark, checkpoint_root=str(tmp_path / "staging"))
+    target = str(tmp_path / "reviewers")
+    spark.createDataFrame([("a", "booking.com", 1), ("b", "booking.com", 2)], ["reviewer_id", "platform", "n"]) \
+        .write.partitionBy("platform").parquet(target)
+
+    merged = spark.read.parquet(target).withColumn("n", col("n") + 10)
+    etl.overwrite_via_staging('reviewers', merged, target, ["platform"])
+
+    assert sorted(row['n'] for row in spark.read.parquet(target).collect()) == [11, 12]
+    assert not (tmp_path / "staging" / "_rewrites" / "reviewers").exists()
+
+
+def test_recover_staged_overwrite_finishes_interrupted_swap(spark, tmp_path):
+    etl = etl_job.YogyakartaTourismETL(None, spark, checkpoint_root=str(tmp_path / "staging"))
+    target = str(tmp_path / "closed")
+    spark.createDataFrame([("a", 1)], ["place_id", "n"]).write.parquet(target)
+
+    # A run staged the rewrite and died while overwriting the target
+    spark.createDataFrame([("a", 1), ("b", 2)], ["place_id", "n"]).write.parquet(etl._staging_path('closed'))
+    etl.recover_staged_overwrite('closed', target)
+
+    assert spark.read.parquet(target).count() == 2
+    etl.recover_staged_overwrite('closed', target)  # nothing staged any more
+    assert spark.read.parquet(target).count() == 2
@@ -0,0 +1,100 @@
+import pytest
+
+from tourism_etl_helpers import (OPENING_SLOTS_PER_DAY, _parse_opening_range, admin_code,
+                                 build_admin_region_index, locate_admin_region, parse_opening_hours,
+                                 summarize_opening_hours)
+
+NNBSP = ' '  # Google Maps puts a narrow no-break space before AM/PM
+
+
+def is_open(bitmap, day, half_hour):
+    index = day * OPENING_SLOTS_PER_DAY + half_hour
+    return bitmap[index // 8] & (1 << (index % 8)) != 0
+
+
+def week(hours_by_day):
+    days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+    return [{'day': day, 'hours': hours} for day, hours in zip(days, hours_by_day)]
+
+
+@pytest.mark.parametrize('text, expected', [
+    (f'9{NNBSP}am to 5:30{NNBSP}pm', (18, 35)),
+    (f'4 to 11{NNBSP}pm', (32, 46)),
+    (f'12 to 6:30{NNBSP}pm', (24, 37)),
+    ('08.00-17.00', (16, 34)),
+    (f'12:15{NNBSP}pm to 2{NNBSP}am', (24, 52)),
+    ('soon', None),
+])
+def test_parse_opening_range(text, expected):
+    assert _parse_opening_range(text) == expected
+
+
+def test_parse_opening_hours_real_week():
+    entries = week([f'9{NNBSP}AM to 5{NNBSP}PM'] * 4 + ['Closed', f'8{NNBSP}AM to 5{NNBSP}PM',
+                                                      f'9{NNBSP}AM to 5{NNBSP}PM'])
+    bitmap = parse_opening_hours(entries)
+
+    assert len(bitmap) == 42
+    assert is_open(bitmap, 0, 18) and not is_open(bitmap, 0, 17) and not is_open(bitmap, 0, 34)
+    assert not any(is_open(bitmap, 4, slot) for slot in range(OPENING_SLOTS_PER_DAY))
+    assert is_open(bitmap, 5, 16) and not is_open(bitmap, 6, 16)
+
+
+def test_parse_opening_hours_unparseable():
+    assert parse_opening_hours(None) is None
+    assert parse_opening_hours([{'day': 'Monday', 'hours': 'by appointment'}]) is None
+
+
+def test_sunday_past_midnight_wraps_to_monday():
+    bitmap = parse_opening_hours([{'day': 'Sunday', 'hours': f'6:30{NNBSP}PM to 2{NNBSP}AM'}])
+    assert is_open(bitmap, 6, 47)
+    assert is_open(bitmap, 0, 3) and not is_open(bitmap, 0, 4)
+
+
+def test_summarize_all_day():
+    bitmap, weekly_hours, days_open, opening_days, open_late, open_weekends = \
+        summarize_opening_hours(week(['Open 24 hours'] * 7))
+    assert weekly_hours == 168.0
+    assert days_open == 7 and opening_days == 0b1111111 and open_late and open_weekends
+
+
+def test_summarize_ignores_spill_over_past_midnight():
+    evening = f'5{NNBSP}PM to 2{NNBSP}AM'
+    bitmap, weekly_hours, days_open, opening_days, open_late, open_weekends = \
+        summarize_opening_hours(week([evening] * 5 + ['Closed', 'Closed']))
+
+    # Friday's range still runs into Saturday morning
+    assert is_open(bitmap, 5, 3)
+    assert weekly_hours == 45.0
+    assert days_open == 5 and opening_days == 0b0011111
+    assert open_late and not open_weekends
+
+
+def test_admin_code():
+    assert admin_code('ID347101') == 347101
+    assert admin_code(None) is None
+    assert admin_code('n/a') is None
+
+
+def square(lat_min, lat_max, lng_min, lng_max):
+    # GeoJSON positions are [lng, lat]
+    return [[lng_min, lat_min], [lng_max, lat_min], [lng_max, lat_max], [lng_min, lat_max], [lng_min, lat_min]]
+
+
+def test_locate_admin_region():
+    features = [
+        {'properties': {'ADM3_PCODE': 'ID347101', 'ADM2_PCODE': 'ID3471'},
+         'geometry': {'type': 'Polygon',
+                      'coordinates': [square(-7.82, -7.78, 110.35, 110.39), square(-7.81, -7.80, 110.36, 110.37)]}},
+        {'properties': {'ADM3_PCODE': 'ID340401', 'ADM2_PCODE': 'ID3404'},
+         'geometry': {'type': 'MultiPolygon',
+                      'coordinates': [[square(-7.78, -7.74, 110.35, 110.39)], [square(-7.70, -7.69, 110.40, 110.41)]]}},
+    ]
+    index = build_admin_region_index(features, 'ADM3_PCODE', 'ADM2_PCODE', 0.01)
+
+    assert locate_admin_region(index, -7.79, 110.38)['code'] == 347101
+    assert locate_admin_region(index, -7.79, 110.38)['parent_code'] == 3471
+    assert locate_admin_region(index, -7.805, 110.365) is None  # inside the hole
+    assert locate_admin_region(index, -7.695, 110.405)['code'] == 340401
+    assert locate_admin_region(index, -7.60, 110.38) is None
+    assert locate_admin_region(index, None, 110.38) is None
@@ -0,0 +1,214 @@
+"""
+Pure-Python parsing helpers for the Glue ETL job: opening-hours bitmaps and
+point-in-polygon administrative regions
+
+Kept free of Spark and Glue imports so they can be tested locally. The Glue
+job loads this module through --extra-py-files.
+"""
+import math
+import re
+
+# Weekly opening-hours bitmaps: 7 days x 48 half-hour slots, Monday first.
+# Slot i = day * 48 + half_hour is bit (i % 8) of byte (i // 8).
+OPENING_SLOTS_PER_DAY = 48
+OPENING_WEEK_SLOTS = 7 * OPENING_SLOTS_PER_DAY
+OPENING_LATE_SLOT = 44  # 22:00
+OPENING_DAY_NAMES = {
+    'monday': 0, 'senin': 0,
+    'tuesday': 1, 'selasa': 1,
+    'wednesday': 2, 'rabu': 2,
+    'thursday': 3, 'kamis': 3,
+    'friday': 4, 'jumat': 4, "jum'at": 4,
+    'saturday': 5, 'sabtu': 5,
+    'sunday': 6, 'minggu': 6,
+}
+OPENING_CLOSED_TEXTS = {'closed', 'tutup'}
+OPENING_ALL_DAY_TEXTS = {'open 24 hours', '24 hours', 'buka 24 jam', '24 jam'}
+OPENING_RANGE_SEPARATOR = re.compile(r'\s*(?:\bto\b|\bsampai\b|s/d|–|—|-)\s*')
+OPENING_TIME_PATTERN = re.compile(r'(\d{1,2})(?:[:.](\d{2}))?\s*([ap])?\.?\s*(?:m\.?)?')
+
+
+def _normalize_opening_text(text):
+    # Google Maps uses narrow no-break spaces before AM/PM
+    return text.replace('\u202f', ' ').replace('\xa0', ' ').strip().lower()
+
+
+def _parse_opening_range(text):
+    """
+    Parse "9 AM to 5:30 PM", "4 to 11 PM" or "08.00-17.00" into a
+    [start, end) half-hour slot range; end may pass midnight
+    """
+    parts = OPENING_RANGE_SEPARATOR.split(text)
+    if len(parts) != 2:
+        return None
+    times = [OPENING_TIME_PATTERN.fullmatch(part.strip()) for part in parts]
+    if times[0] is None or times[1] is None:
+        return None
+    
+    # A start without AM/PM shares the end's ("4 to 11 PM")
+    end_meridiem = times[1].group(3)
+    minutes = []
+    for match in times:
+        hour, minute, meridiem = int(match.group(1)), int(match.group(2) or 0), match.group(3) or end_meridiem
+        if meridiem:
+            hour = hour % 12 + (12 if meridiem == 'p' else 0)
+        minutes.append(hour * 60 + minute)
+    
+    start, end = minutes
+    if end <= start:
+        end += 24 * 60
+    return start // 30, (end + 29) // 30
+
+
+def _parse_opening_week(entries):
+    """
+    Weekly bitmap plus a 7-bit mask of the days with an opening range of
+    their own (bit 0 = Monday); None when nothing could be parsed
+    """
+    if not entries:
+        return None
+    
+    bits = bytearray(OPENING_WEEK_SLOTS // 8)
+    days_mask = 0
+    parsed = False
+    for entry in entries:
+        if entry is None or entry['day'] is None or entry['hours'] is None:
+            continue
+        day = OPENING_DAY_NAMES.get(_normalize_opening_text(entry['day']))
+        if day is None:
+            continue
+        
+        text = _normalize_opening_text(entry['hours'])
+        if text in OPENING_CLOSED_TEXTS:
+            parsed = True
+            continue
+        if text in OPENING_ALL_DAY_TEXTS:
+            ranges = [(0, OPENING_SLOTS_PER_DAY)]
+        else:
+            ranges = [_parse_opening_range(part) for part in text.split(',')]
+        
+        for slot_range in ranges:
+            if slot_range is None:
+                continue
+            parsed = True
+            days_mask |= 1 << day
+            for slot in range(slot_range[0], slot_range[1]):
+                # Ranges past midnight continue into the next day, Sunday into Monday
+                index = (day * OPENING_SLOTS_PER_DAY + slot) % OPENING_WEEK_SLOTS
+                bits[index // 8] |= 1 << (index % 8)
+    
+    return (bits, days_mask) if parsed else None
+
+
+def parse_opening_hours(entries):
+    """
+    Turn Google Maps [{day, hours}] entries into a weekly bitmap; None when
+    nothing could be parsed
+    """
+    week = _parse_opening_week(entries)
+    return None if week is None else week[0]
+
+
+def summarize_opening_hours(entries):
+    """
+    Bitmap plus weekly open hours, days open, the opening days mask, open at
+    22:00 on any day and open on Saturday or Sunday
+
+    Days are counted from the opening ranges listed for them, so the
+    spill-over of a Friday "5 PM to 2 AM" does not make Saturday an open day.
+    """
+    week = _parse_opening_week(entries)
+    if week is None:
+        return None
+    bitmap, days_mask = week
+    
+    def is_open(index):
+        return bitmap[index // 8] & (1 << (index % 8)) != 0
+    
+    open_slots = 0
+    open_late = False
+    for day in range(7):
+        for slot in range(OPENING_SLOTS_PER_DAY):
+            if is_open(day * OPENING_SLOTS_PER_DAY + slot):
+                open_slots += 1
+        open_late = open_late or is_open(day * OPENING_SLOTS_PER_DAY + OPENING_LATE_SLOT)
+    
+    days_open = bin(days_mask).count('1')
+    open_weekends = days_mask & 0b1100000 != 0
+    return (bitmap, open_slots / 2.0, days_open, days_mask, open_late, open_weekends)
+
+
+def admin_code(value):
+    """
+    Compact integer code from a boundary code property ("ID347101" -> 347101)
+    """
+    if value is None:
+        return None
+    digits = re.sub(r'\D', '', str(value))
+    return int(digits) if digits else None
+
+
+def build_admin_region_index(features, code_property, parent_code_property, cell_degrees):
+    """
+    Grid index over GeoJSON Polygon/MultiPolygon features: each cell lists
+    the polygons whose bounding box overlaps it
+    """
+    polygons = []
+    cells = {}
+    for feature in features:
+        properties = feature.get('properties') or {}
+        geometry = feature.get('geometry') or {}
+        code = admin_code(properties.get(code_property))
+        if code is None or geometry.get('type') not in ('Polygon', 'MultiPolygon'):
+            continue
+        parts = [geometry['coordinates']] if geometry['type'] == 'Polygon' else geometry['coordinates']
+        
+        for rings in parts:
+            # GeoJSON positions are [lng, lat]; the first ring is the outline
+            lngs = sorted(point[0] for point in rings[0])
+            lats = sorted(point[1] for point in rings[0])
+            bbox = (lats[0], lats[-1], lngs[0], lngs[-1])
+            polygon_id = len(polygons)
+            polygons.append({
+                'code': code,
+                'parent_code': admin_code(properties.get(parent_code_property)),
+                'bbox': bbox,
+                'rings': [[(point[1], point[0]) for point in ring] for ring in rings]
+            })
+            for lat_cell in range(int(math.floor(bbox[0] / cell_degrees)), int(math.floor(bbox[1] / cell_degrees)) + 1):
+                for lng_cell in range(int(math.floor(bbox[2] / cell_degrees)), int(math.floor(bbox[3] / cell_degrees)) + 1):
+                    cells.setdefault((lat_cell, lng_cell), []).append(polygon_id)
+    
+    return {'polygons': polygons, 'cells': cells, 'cell_degrees': cell_degrees}
+
+
+def _point_in_ring(lat, lng, ring):
+    # Ray casting along the latitude of the point
+    inside = False
+    previous_lat, previous_lng = ring[-1]
+    for ring_lat, ring_lng in ring:
+        if (ring_lat > lat) != (previous_lat > lat):
+            crossing_lng = (previous_lng - ring_lng) * (lat - ring_lat) / (previous_lat - ring_lat) + ring_lng
+            if lng < crossing_lng:
+                inside = not inside
+        previous_lat, previous_lng = ring_lat, ring_lng
+    return inside
+
+
+def locate_admin_region(index, lat, lng):
+    """
+    Polygon containing a point, or None
+    """
+    if lat is None or lng is None or lat != lat or lng != lng:
+        return None
+    cell = (int(math.floor(lat / index['cell_degrees'])), int(math.floor(lng / index['cell_degrees'])))
+    for polygon_id in index['cells'].get(cell, []):
+        polygon = index['polygons'][polygon_id]
+        lat_min, lat_max, lng_min, lng_max = polygon['bbox']
+        if not (lat_min <= lat <= lat_max and lng_min <= lng <= lng_max):
+            continue
+        # Inside the outline and outside every hole
+        if _point_in_ring(lat, lng, polygon['rings'][0]) and not any(
+                _point_in_ring(lat, lng, hole) for hole in polygon['rings'][1:]):
+            return polygon
+    return None
@@ -0,0 +1,556 @@
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import boto3
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = 111.32
+OPENING_SLOTS_PER_DAY = 48
+OPENING_BYTES_PER_DAY = OPENING_SLOTS_PER_DAY // 8
+OPENING_BITMAP_BYTES = 7 * OPENING_BYTES_PER_DAY
+
+
+class YogyakartaTourismLookupService:
+    def __init__(self, cache_dir='lookup_cache', region_name='us-east-1', endpoint_url=None, local_source_dir=None):
+        """
+        Serve point lookups over the processed datasets from memory-mapped
+        Feather files, reloading whenever new output lands
+
+        Outputs are synced from S3 unless local_source_dir points at a local
+        copy of the processed/ prefix.
+        """
+        self.s3_client = None if local_source_dir else boto3.client('s3', region_name=region_name,
+                                                                      endpoint_url=endpoint_url)
+
+        # Configuration
+        self.bucket_name = 'rdv-apify-storage'
+        self.output_prefix = 'processed'
+        self.cache_dir = cache_dir
+        self.local_source_dir = local_source_dir
+        self.grid_cell_degrees = 0.01  # ~1.1 km cells for the spatial index
+        self.reload_interval = 60
+
+        # Platform -> (hotel dataset, hotel id column, review dataset)
+        self.hotel_datasets = {
+            'booking': ('booking_hotels', 'booking_hotel_id', 'booking_reviews'),
+            'tripadvisor': ('tripadvisor_hotels', 'tripadvisor_location_id', 'tripadvisor_reviews')
+        }
+        self.attraction_dataset = 'geospatial_attractions'
+        self.reviewer_dataset = 'reviewers'
+
+        # Free-text columns live in <dataset>_text tables keyed by the id
+        # column, and are only read when a caller asks for text
+        self.text_suffix = '_text'
+        self.text_keys = {
+            'booking_hotels': 'booking_hotel_id',
+            'booking_reviews': 'review_id',
+            'tripadvisor_hotels': 'tripadvisor_location_id',
+            'tripadvisor_reviews': 'review_id',
+            'geospatial_attractions': 'place_id'
+        }
+        self.datasets = [
+            'booking_hotels', 'booking_reviews', 'tripadvisor_hotels',
+            'tripadvisor_reviews', 'geospatial_attractions', 'reviewers'
+        ] + [f"{dataset}{self.text_suffix}" for dataset in self.text_keys]
+
+        # processed/ is appended to on every run, so ids repeat across runs;
+        # each dataset keeps only the latest processed_at row per key
+        self.dataset_keys = {
+            'booking_hotels': 'booking_hotel_id',
+            'booking_reviews': 'review_id',
+            'tripadvisor_hotels': 'tripadvisor_location_id',
+            'tripadvisor_reviews': 'review_id',
+            'geospatial_attractions': 'place_id',
+            'reviewers': 'reviewer_id'
+        }
+        self.dataset_keys.update({f"{dataset}{self.text_suffix}": key_column
+                                  for dataset, key_column in self.text_keys.items()})
+
+        self._snapshot = None
+        self._source_manifest = None
+        self._reload_lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def _list_source_files(self):
+        """
+        Manifest of every processed Parquet file: path -> version stamp
+        """
+        manifest = {}
+        if self.local_source_dir:
+            for dataset in self.datasets:
+                for root, _, files in os.walk(os.path.join(self.local_source_dir, dataset)):
+                    for name in files:
+                        path = os.path.join(root, name)
+                        stat = os.stat(path)
+                        manifest[os.path.relpath(path, self.local_source_dir)] = f"{stat.st_mtime_ns}-{stat.st_size}"
+            return manifest
+
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for dataset in self.datasets:
+            for page in paginator.paginate(Bucket=self.bucket_name, Prefix=f"{self.output_prefix}/{dataset}/"):
+                for obj in page.get('Contents', []):
+                    if not obj['Key'].endswith('/'):
+                        manifest[obj['Key'][len(self.output_prefix) + 1:]] = obj['ETag']
+        return manifest
+
+    def _sync_parquet(self, manifest):
+        """
+        Mirror changed Parquet files into the local cache and drop removed ones
+        """
+        if self.local_source_dir:
+            return self.local_source_dir
+
+        parquet_dir = os.path.join(self.cache_dir, 'parquet')
+        previous = self._source_manifest or {}
+
+        for relative_key, etag in manifest.items():
+            local_path = os.path.join(parquet_dir, relative_key)
+            if previous.get(relative_key) == etag and os.path.exists(local_path):
+                continue
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            self.s3_client.download_file(self.bucket_name, f"{self.output_prefix}/{relative_key}", local_path)
+
+        for relative_key in set(previous) - set(manifest):
+            local_path = os.path.join(parquet_dir, relative_key)
+            if os.path.exists(local_path):
+                os.remove(local_path)
+
+        return parquet_dir
+
+    def _convert_to_feather(self, parquet_dir):
+        """
+        Rewrite each dataset as one uncompressed Feather file, which can be
+        memory-mapped without decoding
+        """
+        feather_dir = os.path.join(self.cache_dir, 'feather', str(int(time.time() * 1000)))
+        os.makedirs(feather_dir, exist_ok=True)
+
+        for dataset in self.datasets:
+            dataset_dir = os.path.join(parquet_dir, dataset)
+            if not os.path.isdir(dataset_dir):
+                continue
+            table = ds.dataset(dataset_dir, format='parquet', partitioning='hive').to_table()
+            latest = self._latest_by_key(table, self.dataset_keys[dataset])
+            if latest.num_rows < table.num_rows:
+                print(f"  {dataset}: dropped {table.num_rows - latest.num_rows} superseded rows")
+            table = latest
+            feather.write_feather(table, os.path.join(feather_dir, f"{dataset}.arrow"), compression='uncompressed')
+
+        return feather_dir
+
+    def _latest_by_key(self, table, key_column):
+        """
+        One row per key, the one with the latest processed_at; rows without
+        a key are kept as they are
+        """
+        if key_column not in table.column_names or table.num_rows == 0:
+            return table
+        if 'processed_at' in table.column_names:
+            table = table.sort_by([('processed_at', 'descending')])
+
+        keys = table.column(key_column)
+        keyed = table.filter(keys.is_valid())
+        unkeyed = table.filter(keys.is_null())
+
+        numbered = keyed.append_column('_row', pa.array(np.arange(keyed.num_rows, dtype='int64')))
+        first_rows = numbered.group_by(key_column).aggregate([('_row', 'min')]).column('_row_min')
+        latest = keyed.take(np.sort(first_rows.to_numpy()))
+        return pa.concat_tables([latest, unkeyed]) if unkeyed.num_rows else latest
+
+    def _column_values(self, table, column):
+        return table.column(column).to_pylist() if column in table.column_names else []
+
+    def _build_key_index(self, table, column, unique):
+        """
+        Hash index from id (as string) to a row number, or to all row numbers
+        """
+        index = {}
+        for row, value in enumerate(self._column_values(table, column)):
+            if value is None:
+                continue
+            key = str(value)
+            if unique:
+                index.setdefault(key, row)
+            else:
+                index.setdefault(key, []).append(row)
+        return index
+
+    def _build_grid_index(self, table):
+        """
+        Grid index over attraction coordinates: cell -> row numbers, plus
+        the opening hours bitmaps as a rows x bytes matrix and the opening
+        days masks (bit 0 = Monday)
+        """
+        latitudes = table.column('latitude').to_numpy(zero_copy_only=False).astype('float64')
+        longitudes = table.column('longitude').to_numpy(zero_copy_only=False).astype('float64')
+
+        # Attractions without opening hours keep an all-closed row
+        opening = np.zeros((table.num_rows, OPENING_BITMAP_BYTES), dtype='uint8')
+        for row, bitmap in enumerate(self._column_values(table, 'opening_hours_bitmap')):
+            if bitmap:
+                opening[row, :len(bitmap)] = np.frombuffer(bitmap[:OPENING_BITMAP_BYTES], dtype='uint8')
+        opening_days = np.zeros(table.num_rows, dtype='int64')
+        for row, days in enumerate(self._column_values(table, 'opening_days')):
+            if days:
+                opening_days[row] = days
+
+        cells = {}
+        for row in np.flatnonzero(~np.isnan(latitudes) & ~np.isnan(longitudes)):
+            cell = (int(math.floor(latitudes[row] / self.grid_cell_degrees)),
+                    int(math.floor(longitudes[row] / self.grid_cell_degrees)))
+            cells.setdefault(cell, []).append(row)
+
+        return {
+            'cells': {cell: np.array(rows, dtype='int64') for cell, rows in cells.items()},
+            'latitudes': latitudes,
+            'longitudes': longitudes,
+            'opening': opening,
+            'opening_days': opening_days
+        }
+
+    def _load_snapshot(self, feather_dir):
+        """
+        Memory-map the Feather files and build all indexes
+        """
+        tables = {}
+        for dataset in self.datasets:
+            path = os.path.join(feather_dir, f"{dataset}.arrow")
+            if os.path.exists(path):
+                tables[dataset] = feather.read_table(path, memory_map=True)
+
+        hotel_index = {}
+        review_index = {}
+        for platform, (hotel_dataset, id_column, review_dataset) in self.hotel_datasets.items():
+            if hotel_dataset in tables:
+                hotel_index[platform] = self._build_key_index(tables[hotel_dataset], id_column, unique=True)
+            if review_dataset in tables:
+                review_index[platform] = self._build_key_index(tables[review_dataset], id_column, unique=False)
+
+        reviewer_index = {}
+        if self.reviewer_dataset in tables:
+            reviewer_index = self._build_key_index(tables[self.reviewer_dataset], 'reviewer_id', unique=True)
+
+        text_index = {}
+        for dataset, key_column in self.text_keys.items():
+            text_dataset = f"{dataset}{self.text_suffix}"
+            if text_dataset in tables:
+                text_index[dataset] = self._build_key_index(tables[text_dataset], key_column, unique=True)
+
+        attraction_grid = None
+        if self.attraction_dataset in tables:
+            attraction_grid = self._build_grid_index(tables[self.attraction_dataset])
+
+        return {
+            'tables': tables,
+            'hotel_index': hotel_index,
+            'review_index': review_index,
+            'reviewer_index': reviewer_index,
+            'text_index': text_index,
+            'attraction_grid': attraction_grid,
+            'feather_dir': feather_dir,
+            'loaded_at': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+    def refresh(self, force=False):
+        """
+        Reload when the processed outputs changed; returns True if reloaded
+        """
+        with self._reload_lock:
+            manifest = self._list_source_files()
+            if not force and self._snapshot is not None and manifest == self._source_manifest:
+                return False
+
+            parquet_dir = self._sync_parquet(manifest)
+            snapshot = self._load_snapshot(self._convert_to_feather(parquet_dir))
+
+            # Swapping the reference is atomic, readers keep the old snapshot
+            previous = self._snapshot
+            self._snapshot = snapshot
+            self._source_manifest = manifest
+
+            row_counts = {name: table.num_rows for name, table in snapshot['tables'].items()}
+            print(f"Loaded lookup snapshot at {snapshot['loaded_at']}: {row_counts}")
+
+            if previous is not None:
+                self._remove_feather_dir(previous['feather_dir'])
+            return True
+
+    def _remove_feather_dir(self, feather_dir):
+        # Old files may still be mapped by in-flight requests; unlinking is
+        # safe on POSIX, so failures elsewhere are only reported
+        for name in os.listdir(feather_dir):
+            try:
+                os.remove(os.path.join(feather_dir, name))
+            except OSError as e:
+                print(f"Could not remove old snapshot file {name}: {e}")
+        try:
+            os.rmdir(feather_dir)
+        except OSError:
+            pass
+
+    def start_auto_reload(self):
+        """
+        Poll for new output in a background thread
+        """
+        def watch():
+            while not self._stop_event.wait(self.reload_interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"Reload failed, keeping current snapshot: {e}")
+
+        thread = threading.Thread(target=watch, name='lookup-reload', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _rows(self, table, rows):
+        return table.take(np.asarray(rows, dtype='int64')).to_pylist()
+
+    def _attach_text(self, snapshot, dataset, records):
+        """
+        Merge the cold text columns of dataset into records, in place
+        """
+        index = snapshot['text_index'].get(dataset)
+        if not index:
+            return records
+        key_column = self.text_keys[dataset]
+        text_table = snapshot['tables'][f"{dataset}{self.text_suffix}"]
+        for record in records:
+            row = index.get(str(record.get(key_column)))
+            if row is not None:
+                text = text_table.slice(row, 1).to_pylist()[0]
+                record.update({name: value for name, value in text.items() if name not in record})
+        return records
+
+    def hotel_by_id(self, platform, hotel_id, include_text=False):
+        """
+        Hotel row by Booking hotelId or TripAdvisor locationId
+        """
+        snapshot = self._snapshot
+        hotel_dataset = self.hotel_datasets[platform][0]
+        row = snapshot['hotel_index'].get(platform, {}).get(str(hotel_id))
+        if row is None:
+            return None
+        hotel = snapshot['tables'][hotel_dataset].slice(row, 1).to_pylist()[0]
+        if include_text:
+            self._attach_text(snapshot, hotel_dataset, [hotel])
+        return hotel
+
+    def reviews_for_hotel(self, platform, hotel_id, limit=50, offset=0, include_text=False):
+        """
+        Reviews of a hotel, in output order, each with its reviewer
+        """
+        snapshot = self._snapshot
+        review_dataset = self.hotel_datasets[platform][2]
+        rows = snapshot['review_index'].get(platform, {}).get(str(hotel_id), [])
+        reviews = self._rows(snapshot['tables'][review_dataset], rows[offset:offset + limit]) if rows else []
+        if include_text:
+            self._attach_text(snapshot, review_dataset, reviews)
+
+        reviewers = snapshot['tables'].get(self.reviewer_dataset)
+        for review in reviews:
+            reviewer_row = snapshot['reviewer_index'].get(str(review.get('reviewer_id')))
+            review['reviewer'] = None if reviewer_row is None else reviewers.slice(reviewer_row, 1).to_pylist()[0]
+        return reviews
+
+    def _validate_open_filter(self, open_days, half_hour):
+        """
+        Reject open_days outside 0-6 and half_hour outside 0-47
+        """
+        if open_days is not None:
+            for day in open_days:
+                if not isinstance(day, int) or not 0 <= day <= 6:
+                    raise ValueError(f"open_days must be days 0-6 (0 = Monday), got {day!r}")
+        if half_hour is not None and (not isinstance(half_hour, int)
+                                      or not 0 <= half_hour < OPENING_SLOTS_PER_DAY):
+            raise ValueError(f"half_hour must be 0-{OPENING_SLOTS_PER_DAY - 1}, got {half_hour!r}")
+
+    def _open_mask(self, bitmaps, opening_days, open_days, half_hour=None):
+        """
+        Which rows are open on any of open_days, in one half-hour slot of
+        the bitmaps, or on the day itself when half_hour is None
+
+        The whole-day check uses the opening days masks, so the hours a
+        previous day's range runs past midnight do not count as a day open.
+        """
+        mask = np.zeros(len(bitmaps), dtype=bool)
+        for day in open_days:
+            if half_hour is None:
+                mask |= (opening_days & (1 << day)) != 0
+            else:
+                index = day * OPENING_SLOTS_PER_DAY + half_hour
+                mask |= (bitmaps[:, index // 8] & (1 << (index % 8))) != 0
+        return mask
+
+    def attractions_near(self, latitude, longitude, radius_km, limit=100, open_days=None, half_hour=None):
+        """
+        Attractions within radius_km of a point, nearest first
+
+        With open_days (0 = Monday), only attractions open on at least one
+        of those days are returned, at half_hour (0-47) when given.
+        """
+        self._validate_open_filter(open_days, half_hour)
+        snapshot = self._snapshot
+        grid = snapshot['attraction_grid']
+        if grid is None:
+            return []
+
+        lat_span = radius_km / KM_PER_DEGREE_LAT
+        lng_span = radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(latitude)), 1e-6))
+        cell = self.grid_cell_degrees
+
+        candidates = []
+        for lat_cell in range(int(math.floor((latitude - lat_span) / cell)), int(math.floor((latitude + lat_span) / cell)) + 1):
+            for lng_cell in range(int(math.floor((longitude - lng_span) / cell)), int(math.floor((longitude + lng_span) / cell)) + 1):
+                rows = grid['cells'].get((lat_cell, lng_cell))
+                if rows is not None:
+                    candidates.append(rows)
+        if not candidates:
+            return []
+
+        rows = np.concatenate(candidates)
+        lat1, lng1 = math.radians(latitude), math.radians(longitude)
+        lat2, lng2 = np.radians(grid['latitudes'][rows]), np.radians(grid['longitudes'][rows])
+        a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+        distances = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+        within = distances <= radius_km
+        if open_days is not None:
+            within &= self._open_mask(grid['opening'][rows], grid['opening_days'][rows], open_days, half_hour)
+        rows, distances = rows[within], distances[within]
+
+        # Only the rows that are returned are converted to Python objects
+        order = np.argsort(distances)[:limit]
+        results = self._rows(snapshot['tables'][self.attraction_dataset], rows[order])
+        for row, distance in zip(results, distances[order]):
+            row['distance_km'] = round(float(distance), 3)
+        return results
+
+    def attractions_near_hotel(self, platform, hotel_id, radius_km, limit=100, open_days=None, half_hour=None):
+        """
+        Attractions within radius_km of hotel H
+        """
+        hotel = self.hotel_by_id(platform, hotel_id)
+        if hotel is None or hotel.get('latitude') is None or hotel.get('longitude') is None:
+            return None
+        return self.attractions_near(hotel['latitude'], hotel['longitude'], radius_km, limit, open_days, half_hour)
+
+    def make_handler(self):
+        """
+        HTTP handler bound to this service
+
+        GET /hotels/<platform>/<id>?text=1
+        GET /hotels/<platform>/<id>/reviews?limit=&offset=&text=1
+        GET /hotels/<platform>/<id>/attractions?radius_km=&limit=&open_days=&open_time=
+        GET /attractions/near?lat=&lng=&radius_km=&limit=&open_days=&open_time=
+
+        open_days is a comma-separated list of days (0 = Monday, e.g. 5,6 for
+        weekends) and open_time an HH:MM time on those days.
+        """
+        service = self
+
+        class LookupHandler(BaseHTTPRequestHandler):
+            def _send(self, status, payload):
+                body = json.dumps(payload, default=str, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _open_filter(self, query):
+                # Bad values raise ValueError, which is answered with a 400
+                open_days = [int(day) for day in query['open_days'].split(',')] if 'open_days' in query else None
+                half_hour = None
+                if 'open_time' in query:
+                    match = re.fullmatch(r'(\d{1,2}):(\d{2})', query['open_time'])
+                    if not match or int(match.group(1)) > 23 or int(match.group(2)) > 59:
+                        raise ValueError(f"open_time must be HH:MM, got {query['open_time']!r}")
+                    half_hour = int(match.group(1)) * 2 + int(match.group(2)) // 30
+                service._validate_open_filter(open_days, half_hour)
+                return open_days, half_hour
+
+            def do_GET(self):
+                started = time.perf_counter()
+                url = urlparse(self.path)
+                parts = [part for part in url.path.split('/') if part]
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+                try:
+                    if service._snapshot is None:
+                        return self._send(503, {'error': 'no snapshot loaded yet'})
+
+                    if len(parts) >= 3 and parts[0] == 'hotels' and parts[1] in service.hotel_datasets:
+                        platform, hotel_id = parts[1], parts[2]
+                        include_text = query.get('text') in ('1', 'true')
+                        if len(parts) == 3:
+                            result = service.hotel_by_id(platform, hotel_id, include_text)
+                        elif parts[3] == 'reviews':
+                            result = service.reviews_for_hotel(platform, hotel_id, int(query.get('limit', 50)),
+                                                               int(query.get('offset', 0)), include_text)
+                        elif parts[3] == 'attractions':
+                            result = service.attractions_near_hotel(platform, hotel_id,
+                                                                    float(query.get('radius_km', 2)),
+                                                                    int(query.get('limit', 100)),
+                                                                    *self._open_filter(query))
+                        else:
+                            return self._send(404, {'error': 'unknown route'})
+                    elif parts == ['attractions', 'near']:
+                        result = service.attractions_near(float(query['lat']), float(query['lng']),
+                                                          float(query.get('radius_km', 2)),
+                                                          int(query.get('limit', 100)),
+                                                          *self._open_filter(query))
+                    else:
+                        return self._send(404, {'error': 'unknown route'})
+                except (KeyError, ValueError) as e:
+                    return self._send(400, {'error': f'bad request: {e}'})
+
+                if result is None:
+                    return self._send(404, {'error': 'not found'})
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                self._send(200, {'result': result, 'elapsed_ms': round(elapsed_ms, 3)})
+
+            def log_message(self, format, *args):
+                pass  # Keep the console quiet on hot paths
+
+        return LookupHandler
+
+    def serve(self, host='127.0.0.1', port=8080):
+        """
+        Load the outputs, start hot reload and serve HTTP until interrupted
+        """
+        self.refresh(force=True)
+        self.start_auto_reload()
+
+        server = ThreadingHTTPServer((host, port), self.make_handler())
+        print(f"Lookup service listening on http://{host}:{port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("Shutting down lookup service")
+        finally:
+            self.stop()
+            server.server_close()
+
+
+# Usage Example
+if __name__ == "__main__":
+    # Optional: local copy of the processed/ prefix instead of syncing from S3
+    local_dir = sys.argv[1] if len(sys.argv) > 1 else None
+
+    service = YogyakartaTourismLookupService(local_source_dir=local_dir)
+    service.serve(port=8080)